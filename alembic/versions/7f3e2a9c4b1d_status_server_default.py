@@ -0,0 +1,38 @@
+"""status server default and index
+
+Revision ID: 7f3e2a9c4b1d
+Revises: 562a908a4ebf
+Create Date: 2026-10-16 04:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3e2a9c4b1d'
+down_revision: Union[str, None] = '562a908a4ebf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JOB_TABLES = ('cloning_jobs', 'translation_jobs', 'speaker_jobs', 'denoise_jobs')
+
+
+def upgrade() -> None:
+    for table in JOB_TABLES:
+        op.execute(f"UPDATE {table} SET status = 'PENDING' WHERE status IS NULL")
+        op.alter_column(table, 'status',
+                   existing_type=sa.Enum(name='processing_status_enum'),
+                   server_default=sa.text("'PENDING'"),
+                   nullable=False)
+        op.create_index(op.f(f'ix_{table}_status'), table, ['status'], unique=False)
+
+
+def downgrade() -> None:
+    for table in JOB_TABLES:
+        op.drop_index(op.f(f'ix_{table}_status'), table_name=table)
+        op.alter_column(table, 'status',
+                   existing_type=sa.Enum(name='processing_status_enum'),
+                   server_default=None,
+                   nullable=(table != 'denoise_jobs'))
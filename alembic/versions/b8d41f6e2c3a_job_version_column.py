@@ -0,0 +1,29 @@
+"""job version column for optimistic locking
+
+Revision ID: b8d41f6e2c3a
+Revises: 7f3e2a9c4b1d
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d41f6e2c3a'
+down_revision: Union[str, None] = '7f3e2a9c4b1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JOB_TABLES = ('cloning_jobs', 'translation_jobs', 'speaker_jobs', 'denoise_jobs')
+
+
+def upgrade() -> None:
+    for table in JOB_TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+
+
+def downgrade() -> None:
+    for table in JOB_TABLES:
+        op.drop_column(table, 'version')
@@ -15,9 +15,12 @@ from app.core.errors import AudioProcessingError
 import logging
 from app.core.constants import CeleryQueues, CeleryTasks
 from app.core.celery_app import celery_app
+from app.core.cache import cache_manager
+import asyncio
 
 router = APIRouter()
 translation_service = TranslationService()
+media_extractor = MediaExtractor()
 
 SUPPORTED_LANGUAGES = {"en", "es", "fr", "de", "it", "pt", "nl", "ru", "zh", "ja", "ko"}
 
@@ -52,7 +55,7 @@ async def create_translation_job(
         
         # Upload to S3
         try:
-            translation_service._upload_to_s3(file.file, file_path)
+            await translation_service.storage_service.upload_file(file.file, file_path)
         except Exception as e:
             raise HTTPException(status_code=500, detail="Failed to upload file")
         
@@ -115,6 +118,14 @@ async def get_translation(
     if not translation:
         raise HTTPException(status_code=404, detail="Translation job not found")
     
+    # Workers only write terminal states; in-flight jobs are marked in Redis
+    if translation.status == ProcessingStatus.PENDING and await asyncio.to_thread(
+        cache_manager.is_job_active, "translation", translation.id
+    ):
+        return TranslationJob.model_validate(translation).model_copy(
+            update={"status": ProcessingStatus.PROCESSING}
+        )
+    
     return translation
 
 # Add new endpoint for URL-based translation
@@ -133,7 +144,6 @@ async def create_translation_job_from_url(
         )
     
     # Extract audio from URL
-    media_extractor = MediaExtractor()
     try:
         local_path, mime_type = await media_extractor.extract_audio(url)
     except AudioProcessingError as e:
@@ -144,8 +154,7 @@ async def create_translation_job_from_url(
     s3_path = f"translations/inputs/{uuid.uuid4()}/{file_name}"
     
     try:
-        with open(local_path, 'rb') as f:
-            translation_service._upload_to_s3(f, s3_path)
+        await translation_service.storage_service.upload_file(local_path, s3_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to upload file")
     finally:
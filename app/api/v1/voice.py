@@ -13,12 +13,14 @@ from app.core.constants import MAX_AUDIO_SIZE, SUPPORTED_AUDIO_FORMATS, CeleryQu
 from app.services.storage_service import StorageService
 from app.core.celery_app import celery_app
 import os
+import asyncio
 import logging
 from celery.result import AsyncResult
 from celery import chain
 from sqlalchemy import and_
 from datetime import timedelta
 from app.core.config import get_settings
+from app.core.cache import cache_manager
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -204,9 +206,17 @@ async def get_cloning_job_status(
                 expiration=3600  # URL valid for 1 hour
             )
         
+        # Workers only write terminal states; in-flight jobs are marked in Redis
+        status = job.status
+        # The Redis client is synchronous; keep the lookup off the event loop
+        if status == ProcessingStatus.PENDING and await asyncio.to_thread(
+            cache_manager.is_job_active, "voice", job.id
+        ):
+            status = ProcessingStatus.PROCESSING
+        
         return {
             'job_id': job.id,
-            'status': job.status.value,
+            'status': status.value,
             'created_at': job.created_at,
             'updated_at': job.updated_at,
             'completed_at': job.completed_at,
@@ -322,26 +332,29 @@ async def retry_failed_jobs(
         jobs = result.scalars().all()
         
         retried_count = 0
-        for job in jobs:
+        # Jobs known up front go out in batches so the worker decodes them together
+        batch_size = settings.XTTS_MAX_BATCH_SIZE
+        for start in range(0, len(jobs), batch_size):
+            batch = jobs[start:start + batch_size]
             try:
-                # Reset job status
-                job.status = ProcessingStatus.PENDING
-                job.error_message = None
-                job.updated_at = datetime.utcnow()
-                
                 # Start new task
                 task = celery_app.send_task(
-                    CeleryTasks.CLONE_VOICE,
-                    args=[job.id],
+                    CeleryTasks.CLONE_VOICE_BATCH,
+                    args=[[job.id for job in batch]],
                     queue=CeleryQueues.VOICE
                 )
                 
-                # Update task ID
-                job.task_id = task.id
-                retried_count += 1
+                for job in batch:
+                    # Reset job status
+                    job.status = ProcessingStatus.PENDING
+                    job.error_message = None
+                    job.updated_at = datetime.utcnow()
+                    # Update task ID
+                    job.task_id = task.id
+                retried_count += len(batch)
                 
             except Exception as e:
-                logger.error(f"Failed to retry job {job.id}: {str(e)}")
+                logger.error(f"Failed to retry jobs {[job.id for job in batch]}: {str(e)}")
                 continue
         
         await db.commit()
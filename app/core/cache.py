@@ -10,6 +10,8 @@ settings = get_settings()
 
 # Add to cache configuration
 DENOISED_AUDIO_CACHE_TTL = 3600  # 1 hour
+# "Processing" markers outlive the longest task so a dead worker's marker still expires
+JOB_HEARTBEAT_TTL = settings.TASK_HARD_TIMEOUT
 
 class CacheManager:
     def __init__(self):
@@ -65,6 +67,31 @@ class CacheManager:
             logger.error(f"Cache increment error: {e}")
             return 0
 
+    def _job_key(self, job_type: str, job_id: int) -> str:
+        return f"job:{job_type}:{job_id}:heartbeat"
+
+    def mark_job_active(self, job_type: str, job_id: int) -> None:
+        """Record that a worker is processing a job, without a database write"""
+        try:
+            self.redis.set(self._job_key(job_type, job_id), 1, ex=JOB_HEARTBEAT_TTL)
+        except Exception as e:
+            logger.error(f"Job heartbeat error: {e}")
+
+    def clear_job_active(self, job_type: str, job_id: int) -> None:
+        """Drop the processing marker once the job reaches a terminal state"""
+        try:
+            self.redis.delete(self._job_key(job_type, job_id))
+        except Exception as e:
+            logger.error(f"Job heartbeat error: {e}")
+
+    def is_job_active(self, job_type: str, job_id: int) -> bool:
+        """Whether a worker currently holds the job"""
+        try:
+            return bool(self.redis.exists(self._job_key(job_type, job_id)))
+        except Exception as e:
+            logger.error(f"Job heartbeat error: {e}")
+            return False
+
     async def get_or_set(
         self,
         key: str,
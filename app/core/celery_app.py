@@ -31,11 +31,13 @@ celery_app.conf.update(
     # Queue routing
     task_routes={
         CeleryTasks.CLONE_VOICE: {'queue': CeleryQueues.VOICE},
+        CeleryTasks.CLONE_VOICE_BATCH: {'queue': CeleryQueues.VOICE},
         CeleryTasks.TRANSLATE_AUDIO: {'queue': CeleryQueues.TRANSLATION},
         CeleryTasks.DIARIZE_SPEAKERS: {'queue': CeleryQueues.SPEAKER},
         CeleryTasks.EXTRACT_SPEAKERS: {'queue': CeleryQueues.SPEAKER},
         CeleryTasks.DENOISE_AUDIO: {'queue': CeleryQueues.DENOISER},
         CeleryTasks.SPECTRAL_DENOISE_AUDIO: {'queue': CeleryQueues.SPECTRAL},
+        CeleryTasks.SPECTRAL_DENOISE_AUDIO_BATCH: {'queue': CeleryQueues.SPECTRAL},
         'voice_cleanup': {'queue': CeleryQueues.VOICE},
         'translation_cleanup': {'queue': CeleryQueues.TRANSLATION},
         'speaker_cleanup': {'queue': CeleryQueues.SPEAKER},
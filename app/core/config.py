@@ -33,14 +33,17 @@ class Settings(BaseSettings):
     S3_BUCKET: str
     S3_REGION: str
     MULTIPART_THRESHOLD: int = 8 * 1024 * 1024  # 8MB
-    MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024  # 8MB
-    MAX_CONCURRENCY: int = 10
+    MULTIPART_CHUNKSIZE: int = 16 * 1024 * 1024  # 16MB
+    MAX_CONCURRENCY: int = 16  # in-flight multipart parts per transfer
+    S3_MAX_POOL_CONNECTIONS: int = 128  # keep at or above 4 * MAX_CONCURRENCY
     DOWNLOAD_DIR: str = "/tmp/downloads"
     UPLOAD_DIR: str = "/tmp/uploads"
     
     # Model Paths
     WHISPER_MODEL_PATH: str = "models/model.bin"
     WHISPER_CONFIG_PATH: str = "models/config.json"
+    WHISPER_WORKERS: int = 2  # parallel transcriptions per WhisperModel
+    WHISPER_MAX_CONCURRENCY: int = 2  # in-flight transcriptions per process, bounded by GPU memory
     
     # XTTS model paths
     XTTS_BASE_DIR: str = "models/XTTS-v2"
@@ -48,6 +51,21 @@ class Settings(BaseSettings):
     XTTS_CONFIG_PATH: str = "models/XTTS-v2/config.json"
     XTTS_VOCAB_PATH: str = "models/XTTS-v2/vocab.json"
     XTTS_SPEAKERS_PATH: str = "models/XTTS-v2/speakers.pth"
+    XTTS_BATCH_WINDOW_MS: int = 20  # how long the scheduler waits to group requests
+    XTTS_MAX_BATCH_SIZE: int = 8
+    XTTS_LATENT_CACHE_SIZE: int = 64  # speaker conditioning latents kept on device
+    XTTS_TOKEN_CACHE_SIZE: int = 1024  # normalized + tokenized texts kept per process
+    XTTS_USE_DEEPSPEED: bool = True  # fused GPT kernels when deepspeed is installed
+    XTTS_QUANTIZED: bool = False  # bf16 on GPUs that support it, int8 dynamic GPT linears on CPU
+    XTTS_FP16: bool = True  # half-precision GPT and vocoder on CUDA
+    XTTS_COMPILE: bool = False  # torch.compile the GPT decode step; recompiles can spike latency
+    XTTS_HEARTBEAT_SECONDS: float = 5.0  # progress re-reported while waiting on synthesis
+    XTTS_SYNTHESIS_TIMEOUT: float = 3300.0  # threads-pool workers get no Celery time limit
+    XTTS_PRELOAD_MODEL: bool = False  # load XTTS in each worker process before the first task
+    
+    # GPU cache housekeeping
+    CACHE_CLEAR_EVERY_N: int = 50  # requests between torch.cuda.empty_cache() calls
+    CACHE_CLEAR_SLACK_BYTES: int = 2 * 1024 * 1024 * 1024  # reserved-but-unused memory that forces a clear
     
     # Worker Settings
     WORKER_CONCURRENCY: int = 2
@@ -119,10 +137,13 @@ class Settings(BaseSettings):
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 1800  # 30 minutes
+    SYNC_DB_POOL_SIZE: int = 8  # Celery threads x2; the sync pool never overflows
     DB_ECHO: bool = False
     DB_ECHO_POOL: bool = False
     DB_PRE_PING: bool = True
     DB_POOL_RESET_ON_RETURN: str = "rollback"
+    DB_STATEMENT_CACHE_SIZE: int = 1024  # asyncpg prepared statements per connection
+    DB_STATEMENT_CACHE_LIFETIME: int = 600  # seconds
 
     # Connection Pool Settings
     ASYNC_POOL_SIZE: int = 20
@@ -146,11 +167,16 @@ class Settings(BaseSettings):
     # HuggingFace Settings
     HF_TOKEN: str  # Required for pyannote models
     HF_CACHE_DIR: str = "models/huggingface"
+    HF_HUB_OFFLINE: bool = False  # serve cached models without hub lookups; export before startup
     
     # Speaker Analysis Settings
     MAX_SPEAKERS: int = 10
     MIN_SPEAKER_TIME: float = 1.0  # Minimum speaking time in seconds
     SPEAKER_OVERLAP_THRESHOLD: float = 0.5  # Overlap threshold for diarization
+    SPEAKER_EMBEDDING_BATCH_SIZE: int | None = None  # None picks by GPU memory
+    SPEAKER_SEGMENTATION_BATCH_SIZE: int | None = None  # None picks by GPU memory
+    SPEAKER_EMBEDDING_FP16: bool = True  # fp16 embedding forward on CUDA
+    SPEAKER_AUTOCAST: bool = True  # fp16 autocast for pipeline forward passes on CUDA
     
     # Queue Settings
     SPEAKER_QUEUE_CONCURRENCY: int = 2
@@ -187,6 +213,17 @@ class Settings(BaseSettings):
     # Denoiser settings
     DENOISER_MODEL: str = "dns64"  # dns48 or dns64
     DENOISER_CHUNK_SIZE: int = 10  # seconds
+    DENOISER_BATCH_SIZE: int = 8  # chunks per forward pass
+    DENOISER_PROCESS_TIMEOUT: int = 900  # seconds; threads-pool workers get no Celery time limit
+    DENOISER_COMPILE: bool = True  # torch.compile the model at startup; CUDA only
+    DENOISER_CUDA_GRAPH: bool = True  # replay full batches from a CUDA graph when not compiled
+    DENOISER_PRELOAD_WEIGHTS: bool = True  # load weights in the Celery parent process
+    DENOISER_WARM_START: bool = False  # build the GPU denoiser in each worker before the first task
+    SPECTRAL_BLOCK_SECONDS: int = 30  # spectral denoiser streams the file in blocks of this length
+    SPECTRAL_BLOCK_OVERLAP_SECONDS: int = 2  # crossfaded overlap between spectral blocks
+    SPECTRAL_PREFETCH_CONCURRENCY: int = 4  # inputs downloading ahead of the batch denoiser
+    SPECTRAL_NUMA_PIN: bool = False  # pin each spectral worker to NUMA node CELERY_WORKER_ID % nodes
+    SPOOL_MAX_SIZE: int = 64 * 1024 * 1024  # in-memory audio buffers spill to disk past this size
     DENOISER_MAX_MEMORY: int = 4096  # MB
     DENOISER_USE_CUDA: bool = True
     DENOISER_NUM_THREADS: int = 4
@@ -75,11 +75,13 @@ class CeleryQueues:
 
 class CeleryTasks:
     CLONE_VOICE = "app.workers.voice_tasks.clone_voice"
+    CLONE_VOICE_BATCH = "app.workers.voice_tasks.clone_voice_batch"
     TRANSLATE_AUDIO = "app.workers.translation_tasks.translate_audio"
     DIARIZE_SPEAKERS = "app.workers.speaker_tasks.diarize_speakers"
     EXTRACT_SPEAKERS = "app.workers.speaker_tasks.extract_speakers"
     DENOISE_AUDIO = "app.workers.denoiser_tasks.denoise_audio"
     SPECTRAL_DENOISE_AUDIO = "app.workers.spectral_denoiser_tasks.denoise_audio"
+    SPECTRAL_DENOISE_AUDIO_BATCH = "app.workers.spectral_denoiser_tasks.denoise_audio_batch"
 
 class TaskTimeouts:
     VOICE_SOFT_TIMEOUT = 3300  # 55 minutes
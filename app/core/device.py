@@ -1,6 +1,6 @@
 import torch
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import psutil
 from app.core.config import get_settings
 from app.core.metrics import RESOURCE_USAGE, GPU_METRICS
@@ -20,6 +20,7 @@ class DeviceManager:
     def _initialize(self):
         """Initialize device settings"""
         self.settings = get_settings()
+        self._requests_since_clear = 0
         self._setup_device()
         self._setup_compute_type()
 
@@ -80,6 +81,13 @@ class DeviceManager:
             torch.cuda.empty_cache()
             logger.debug("Cleared GPU cache")
 
+    def maybe_clear_cache(self):
+        """Clear GPU cache every N requests or when too much reserved memory sits idle"""
+        self._requests_since_clear += 1
+        if cache_clear_due(self._requests_since_clear):
+            self.clear_cache()
+            self._requests_since_clear = 0
+
     def get_device(self) -> torch.device:
         """Get current device"""
         return self.device
@@ -88,6 +96,40 @@ class DeviceManager:
         """Get current compute type"""
         return self.compute_type
 
+def default_pipeline_batch_size() -> int:
+    """Pyannote batch size that fits the GPU: 8 below 12GB of VRAM, else 32"""
+    if torch.cuda.is_available():
+        total_memory = torch.cuda.get_device_properties(0).total_memory
+        if total_memory < 12 * 1024**3:
+            return 8
+    return 32
+
+def cache_clear_due(requests_since_clear: int) -> bool:
+    """Whether an empty_cache() is worth its cost right now"""
+    if not torch.cuda.is_available():
+        return False
+    if requests_since_clear >= settings.CACHE_CLEAR_EVERY_N:
+        return True
+    slack = torch.cuda.memory_reserved() - torch.cuda.memory_allocated()
+    return slack > settings.CACHE_CLEAR_SLACK_BYTES
+
+def to_device_async(
+    tensor: torch.Tensor,
+    device: torch.device,
+    stream: Optional[torch.cuda.Stream]
+) -> torch.Tensor:
+    """Copy a host tensor to the GPU from pinned memory on a side stream"""
+    if stream is None or device.type != "cuda":
+        return tensor.to(device)
+    
+    host = tensor if tensor.is_pinned() else tensor.pin_memory()
+    with torch.cuda.stream(stream):
+        result = host.to(device, non_blocking=True)
+    torch.cuda.current_stream().wait_stream(stream)
+    # Allocated on the side stream but consumed on the current one
+    result.record_stream(torch.cuda.current_stream())
+    return result
+
 def get_device_manager() -> DeviceManager:
     """Get singleton instance of DeviceManager"""
     return DeviceManager() 
\ No newline at end of file
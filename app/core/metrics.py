@@ -126,6 +126,15 @@ DB_OPERATION_LATENCY = MetricsRegistry.register_metric(
     buckets=[0.01, 0.05, 0.1, 0.5, 1.0]
 )
 
+# Session lifetime includes request handling, so it's kept apart from operation latency
+DB_SESSION_DURATION = MetricsRegistry.register_metric(
+    'db_session_duration_seconds',
+    Histogram,
+    'Lifetime of a database session',
+    ['scope'],
+    buckets=[0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0]
+)
+
 # Queue Metrics
 QUEUE_SIZE = MetricsRegistry.register_metric(
     'queue_size',
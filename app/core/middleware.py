@@ -1,5 +1,5 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import redis
 from app.core.config import get_settings
 import time
@@ -47,7 +47,7 @@ async def rate_limit_middleware(request: Request, call_next):
     client_ip = request.client.host
     
     if not await limiter.check_rate_limit(client_ip):
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=429,
             content={"detail": "Too many requests"}
         )
@@ -57,7 +57,7 @@ async def rate_limit_middleware(request: Request, call_next):
 
 async def metrics_middleware(request: Request, call_next):
     """Middleware to collect request metrics"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         response = await call_next(request)
@@ -69,7 +69,7 @@ async def metrics_middleware(request: Request, call_next):
         ).inc()
         
         # Record latency
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         REQUEST_LATENCY.labels(
             endpoint=request.url.path
         ).observe(duration)
@@ -20,7 +20,7 @@ ERROR_COUNT = Counter('error_total', 'Total errors', ['type', 'severity'])
 
 class PerformanceMonitor:
     def __init__(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         self.memory_manager = memory_manager
 
     def track_request(self, method: str, endpoint: str):
@@ -53,7 +53,7 @@ class PerformanceMonitor:
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get current performance statistics"""
         return {
-            'uptime_seconds': time.time() - self.start_time,
+            'uptime_seconds': time.perf_counter() - self.start_time,
             'memory_stats': self.memory_manager.get_memory_stats(),
             'cpu_percent': psutil.cpu_percent(),
             'open_files': len(psutil.Process().open_files()),
@@ -65,10 +65,10 @@ def track_performance(task_type: str = None):
     def decorator(func):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
                 result = await func(*args, **kwargs)
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 if task_type:
                     TASK_PROCESSING_TIME.labels(task_type=task_type).observe(duration)
                 return result
@@ -78,10 +78,10 @@ def track_performance(task_type: str = None):
                 
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 if task_type:
                     TASK_PROCESSING_TIME.labels(task_type=task_type).observe(duration)
                 return result
@@ -4,9 +4,13 @@ import gc
 import logging
 import psutil
 import os
-from typing import Dict, Any
+import glob
+import mmap
+import numpy as np
+from typing import Dict, Any, List, Set
 from app.core.metrics import MEMORY_USAGE, GPU_MEMORY_USAGE, GPU_UTILIZATION
 from functools import wraps
+from app.core.device import cache_clear_due
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +19,7 @@ class ResourceOptimizer:
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.is_gpu_available = torch.cuda.is_available()
         self.process = psutil.Process(os.getpid())
+        self._requests_since_cleanup = 0
 
     def optimize_for_inference(self):
         """Optimize system for model inference"""
@@ -73,6 +78,15 @@ class ResourceOptimizer:
         
         self._update_all_metrics()
 
+    def maybe_cleanup(self):
+        """Run cleanup() only every N requests or under memory pressure"""
+        self._requests_since_cleanup += 1
+        if cache_clear_due(self._requests_since_cleanup):
+            self.cleanup()
+            self._requests_since_cleanup = 0
+        else:
+            self._update_all_metrics()
+
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get current memory statistics"""
         stats = {
@@ -161,4 +175,49 @@ def optimize_array_processing(func):
             
     return wrapper
 
+def _parse_cpulist(cpulist: str) -> Set[int]:
+    """Parse a sysfs cpulist such as '0-3,8-11'"""
+    cpus = set()
+    for part in cpulist.strip().split(","):
+        if "-" in part:
+            lo, hi = part.split("-")
+            cpus.update(range(int(lo), int(hi) + 1))
+        elif part:
+            cpus.add(int(part))
+    return cpus
+
+def numa_node_cpus() -> List[Set[int]]:
+    """CPUs of each NUMA node, empty if the topology isn't exposed"""
+    nodes = []
+    for path in sorted(glob.glob("/sys/devices/system/node/node[0-9]*/cpulist")):
+        with open(path) as f:
+            cpus = _parse_cpulist(f.read())
+        if cpus:
+            nodes.append(cpus)
+    return nodes
+
+def pin_to_numa_node(worker_id: int) -> None:
+    """Pin this process to the CPUs of NUMA node worker_id % node count"""
+    nodes = numa_node_cpus()
+    if len(nodes) < 2 or not hasattr(os, "sched_setaffinity"):
+        return
+    cpus = nodes[worker_id % len(nodes)] & os.sched_getaffinity(0)
+    if cpus:
+        # Memory is first-touch allocated, so buffers follow the pinned CPUs
+        os.sched_setaffinity(0, cpus)
+        logger.info(f"Pinned worker {worker_id} to NUMA node {worker_id % len(nodes)}")
+
+def hugepage_array(length: int, dtype=np.float32) -> np.ndarray:
+    """Uninitialized array backed by an anonymous mapping advised for huge pages"""
+    dtype = np.dtype(dtype)
+    if not hasattr(mmap, "MADV_HUGEPAGE"):
+        return np.empty(length, dtype=dtype)
+    buf = mmap.mmap(-1, max(length * dtype.itemsize, 1), flags=mmap.MAP_PRIVATE)
+    try:
+        buf.madvise(mmap.MADV_HUGEPAGE)
+    except OSError:
+        # THP disabled; the mapping still works with normal pages
+        pass
+    return np.frombuffer(buf, dtype=dtype, count=length)
+
 resource_optimizer = ResourceOptimizer()
\ No newline at end of file
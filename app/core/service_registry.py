@@ -7,6 +7,7 @@ from app.services.speaker_diarization import SpeakerDiarizationService
 from app.services.speaker_extraction import SpeakerExtractionService
 from app.core.cache import cache_manager
 import logging
+import threading
 from app.services.spectral_denoiser_service import SpectralDenoiserService
 from app.services.denoiser_service import DenoiserService
 
@@ -14,14 +15,20 @@ logger = logging.getLogger(__name__)
 
 class ServiceRegistry:
     _instances: Dict[Type, Any] = {}
+    _lock = threading.Lock()
     
     @classmethod
     def get_service(cls, service_class: Type) -> Any:
         """Get or create service instance"""
-        if service_class not in cls._instances:
-            logger.debug(f"Creating new instance of {service_class.__name__}")
-            cls._instances[service_class] = service_class()
-        return cls._instances[service_class]
+        instance = cls._instances.get(service_class)
+        if instance is None:
+            # Thread pools share the registry; build each service only once
+            with cls._lock:
+                instance = cls._instances.get(service_class)
+                if instance is None:
+                    logger.debug(f"Creating new instance of {service_class.__name__}")
+                    instance = cls._instances[service_class] = service_class()
+        return instance
     
     @classmethod
     def clear(cls):
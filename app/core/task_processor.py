@@ -112,14 +112,14 @@ class TaskProcessor:
         def decorator(func):
             @wraps(func)
             async def async_wrapper(*args, **kwargs):
-                start_time = time.time()
+                start_time = time.perf_counter()
                 self.prepare_for_task(task_type)
                 
                 try:
                     result = await func(*args, **kwargs)
                     
                     # Record success metrics
-                    duration = time.time() - start_time
+                    duration = time.perf_counter() - start_time
                     TASK_PROCESSING_TIME.labels(
                         task_type=task_type,
                         status="success"
@@ -147,14 +147,14 @@ class TaskProcessor:
             
             @wraps(func)
             def sync_wrapper(*args, **kwargs):
-                start_time = time.time()
+                start_time = time.perf_counter()
                 self.prepare_for_task(task_type)
                 
                 try:
                     result = func(*args, **kwargs)
                     
                     # Record success metrics
-                    duration = time.time() - start_time
+                    duration = time.perf_counter() - start_time
                     TASK_PROCESSING_TIME.labels(
                         task_type=task_type,
                         status="success"
@@ -193,7 +193,7 @@ class TaskProcessor:
         metric = (SPEAKER_DIARIZATION_TIME if task_type == "diarization" 
                  else SPEAKER_EXTRACTION_TIME)
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             # Get appropriate service
             if task_type == "diarization":
@@ -204,7 +204,7 @@ class TaskProcessor:
                 result = await service.process_audio(job_id)
 
             # Record metrics
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             metric.labels(status="success").observe(duration)
             
             if "num_speakers" in result:
@@ -213,7 +213,7 @@ class TaskProcessor:
             return result
 
         except Exception as e:
-            metric.labels(status="failure").observe(time.time() - start_time)
+            metric.labels(status="failure").observe(time.perf_counter() - start_time)
             logger.exception(f"Speaker {task_type} task failed")
             raise
 
@@ -222,7 +222,7 @@ class TaskProcessor:
         job_id: int
     ) -> Dict[str, Any]:
         """Process audio denoising with metrics tracking"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             async with AsyncSessionLocal() as db:
                 job = await db.get(DenoiseJob, job_id)
@@ -247,7 +247,7 @@ class TaskProcessor:
                         )
                         
                         # Record metrics
-                        duration = time.time() - start_time
+                        duration = time.perf_counter() - start_time
                         DENOISING_PROCESSING_TIME.labels(status="success").observe(duration)
                         
                         if "noise_reduction_db" in result["stats"]:
@@ -267,7 +267,7 @@ class TaskProcessor:
                                 
         except Exception as e:
             DENOISING_PROCESSING_TIME.labels(status="failure").observe(
-                time.time() - start_time
+                time.perf_counter() - start_time
             )
             logger.exception("Denoising task failed")
             raise
@@ -277,7 +277,7 @@ class TaskProcessor:
         job_id: int
     ) -> Dict[str, Any]:
         """Process audio denoising with spectral gating"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             async with AsyncSessionLocal() as db:
                 job = await db.get(DenoiseJob, job_id)
@@ -303,7 +303,7 @@ class TaskProcessor:
                         )
                         
                         # Record metrics
-                        duration = time.time() - start_time
+                        duration = time.perf_counter() - start_time
                         SPECTRAL_DENOISING_TIME.labels(status="success").observe(duration)
                         
                         if "noise_reduction_db" in result["stats"]:
@@ -323,7 +323,7 @@ class TaskProcessor:
                                 
         except Exception as e:
             SPECTRAL_DENOISING_TIME.labels(status="failure").observe(
-                time.time() - start_time
+                time.perf_counter() - start_time
             )
             logger.exception("Spectral denoising task failed")
             raise
@@ -0,0 +1,48 @@
+"""Persistent event loop for running async code from sync Celery tasks"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Coroutine, Optional
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_pid: Optional[int] = None
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Get the process-wide loop, starting its thread on first use"""
+    global _loop, _thread, _pid
+    # A forked child inherits the loop object but not the thread running it
+    if _loop is None or _pid != os.getpid():
+        with _lock:
+            if _loop is None or _pid != os.getpid():
+                _loop = asyncio.new_event_loop()
+                _thread = threading.Thread(target=_loop.run_forever, name="worker-loop", daemon=True)
+                _thread.start()
+                _pid = os.getpid()
+                logger.debug("Started persistent worker event loop")
+    return _loop
+
+def run_async(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the persistent loop and wait for its result"""
+    future = asyncio.run_coroutine_threadsafe(coro, get_worker_loop())
+    try:
+        return future.result(timeout)
+    except BaseException:
+        # Timeouts and soft time limits interrupt the wait, not the coroutine; cancel it too
+        future.cancel()
+        raise
+
+def stop_worker_loop(timeout: float = 5.0) -> None:
+    """Stop the loop thread, e.g. on worker shutdown"""
+    global _loop, _thread, _pid
+    with _lock:
+        if _loop is None or _pid != os.getpid():
+            return
+        _loop.call_soon_threadsafe(_loop.stop)
+        if _thread is not None:
+            _thread.join(timeout)
+        _loop = _thread = _pid = None
@@ -1,3 +1,4 @@
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import DeclarativeBase
 
-Base = declarative_base() 
\ No newline at end of file
+class Base(DeclarativeBase):
+    pass
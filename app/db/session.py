@@ -1,10 +1,19 @@
+from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import get_settings
+from app.core.metrics import DB_SESSION_DURATION
 from typing import AsyncGenerator
+from functools import lru_cache
+import orjson
+import time
 
 settings = get_settings()
 
+def _json_serializer(value) -> str:
+    """JSON/JSONB columns: orjson writes numpy arrays and datetimes natively"""
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC).decode()
+
 # Create async engine
 engine = create_async_engine(
     settings.async_database_url,
@@ -14,7 +23,13 @@ engine = create_async_engine(
     pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_recycle=settings.DB_POOL_RECYCLE,
     echo=settings.DB_ECHO,
-    echo_pool=settings.DB_ECHO_POOL
+    echo_pool=settings.DB_ECHO_POOL,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    connect_args={
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "max_cached_statement_lifetime": settings.DB_STATEMENT_CACHE_LIFETIME
+    }
 )
 
 # Create async session factory
@@ -26,8 +41,25 @@ AsyncSessionLocal = sessionmaker(
     autoflush=False
 )
 
+@lru_cache(maxsize=1)
+def get_sync_sessionmaker() -> sessionmaker:
+    """Lazily create the synchronous session factory used by Celery tasks"""
+    sync_engine = create_engine(
+        settings.sync_database_url,
+        pool_pre_ping=True,
+        pool_size=settings.SYNC_DB_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        echo=settings.DB_ECHO,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads
+    )
+    return sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for getting async database session"""
+    start = time.perf_counter_ns()
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -35,4 +67,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+            DB_SESSION_DURATION.labels(scope="request").observe(
+                (time.perf_counter_ns() - start) / 1e9
+            )
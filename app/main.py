@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1 import voice, translation, auth, speaker, denoiser
 from app.core.config import get_settings
@@ -21,7 +22,8 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -42,15 +44,13 @@ metrics_app = make_asgi_app()
 app.mount("/metrics", metrics_app)
 
 # Include API routers
-app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
-app.include_router(voice.router, prefix=f"{settings.API_V1_STR}/voice", tags=["voice"])
-app.include_router(translation.router, prefix=f"{settings.API_V1_STR}/translation", tags=["translation"])
-app.include_router(speaker.router, prefix=f"{settings.API_V1_STR}/speaker", tags=["speaker"])
-app.include_router(
-    denoiser.router,
-    prefix=f"{settings.API_V1_STR}/denoiser",
-    tags=["denoiser"]
-)
+api_v1 = APIRouter(prefix=settings.API_V1_STR)
+api_v1.include_router(auth.router, prefix="/auth", tags=["auth"])
+api_v1.include_router(voice.router, prefix="/voice", tags=["voice"])
+api_v1.include_router(translation.router, prefix="/translation", tags=["translation"])
+api_v1.include_router(speaker.router, prefix="/speaker", tags=["speaker"])
+api_v1.include_router(denoiser.router, prefix="/denoiser", tags=["denoiser"])
+app.include_router(api_v1)
 
 @app.on_event("startup")
 async def startup_event():
@@ -1,11 +1,11 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, Enum as SQLEnum, Float, Text
+from sqlalchemy import Integer, String, ForeignKey, DateTime, JSON, Enum as SQLEnum, Float, Text
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column, relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 from datetime import datetime
 from enum import Enum as PyEnum
-from typing import Optional
+from typing import Any, List, Optional
 
 class ProcessingStatus(str, PyEnum):
     PENDING = "pending"
@@ -24,58 +24,70 @@ class BaseJob(Base):
     """Base class for all processing jobs"""
     __abstract__ = True
 
-    id = Column(Integer, primary_key=True, index=True)
-    status = Column(SQLEnum(ProcessingStatus, name="processing_status_enum"), default=ProcessingStatus.PENDING)
-    task_id = Column(String, index=True, nullable=True)
-    input_path = Column(String, nullable=False)
-    error_message = Column(String, nullable=True)
-    parameters = Column(JSONB, nullable=True)
-    result = Column(JSONB, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    completed_at = Column(DateTime(timezone=True), nullable=True)
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict[str, Any]:
+        # Commits fail with StaleDataError instead of overwriting a concurrent update
+        return {"eager_defaults": True, "version_id_col": cls.version}
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    version: Mapped[int] = mapped_column(Integer, server_default="1", nullable=False)
+    # Enum labels are stored by member name, so the server default is 'PENDING'
+    status: Mapped[ProcessingStatus] = mapped_column(
+        SQLEnum(ProcessingStatus, name="processing_status_enum"),
+        server_default=ProcessingStatus.PENDING.name,
+        nullable=False,
+        index=True
+    )
+    task_id: Mapped[Optional[str]] = mapped_column(String, index=True, nullable=True)
+    input_path: Mapped[str] = mapped_column(String, nullable=False)
+    error_message: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    parameters: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    result: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now())
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
 class Voice(Base):
     """Model for voice profiles"""
     __tablename__ = "voices"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False)
-    description = Column(String, nullable=True)
-    file_path = Column(String, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    file_path: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    cloning_jobs = relationship("CloningJob", back_populates="voice")
+    cloning_jobs: Mapped[List["CloningJob"]] = relationship(back_populates="voice")
 
 class CloningJob(BaseJob):
     """Model for voice cloning jobs"""
     __tablename__ = "cloning_jobs"
 
-    voice_id = Column(Integer, ForeignKey("voices.id"))
-    input_text = Column(String, nullable=False)
-    output_path = Column(String, nullable=True)
+    voice_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("voices.id"))
+    input_text: Mapped[str] = mapped_column(String, nullable=False)
+    output_path: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
     # Relationships
-    voice = relationship("Voice", back_populates="cloning_jobs")
+    voice: Mapped[Optional["Voice"]] = relationship(back_populates="cloning_jobs")
 
 class TranslationJob(BaseJob):
     """Model for translation jobs"""
     __tablename__ = "translation_jobs"
 
-    source_language = Column(String, nullable=True)
-    target_language = Column(String, nullable=False)
-    transcript_path = Column(String, nullable=True)
-    audio_output_path = Column(String, nullable=True)
+    source_language: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    target_language: Mapped[str] = mapped_column(String, nullable=False)
+    transcript_path: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    audio_output_path: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
 class SpeakerJob(BaseJob):
     """Model for speaker diarization and extraction jobs"""
     __tablename__ = "speaker_jobs"
 
-    job_type = Column(SQLEnum(JobType, name="job_type_enum"), nullable=False)
-    num_speakers = Column(Integer, nullable=True)
-    rttm_path = Column(String, nullable=True)
-    output_paths = Column(JSON, nullable=True)  # List of output audio file paths
+    job_type: Mapped[JobType] = mapped_column(SQLEnum(JobType, name="job_type_enum"), nullable=False)
+    num_speakers: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    rttm_path: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    output_paths: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)  # List of output audio file paths
 
     @property
     def is_diarization(self):
@@ -89,17 +101,25 @@ class DenoiseJob(Base):
     """Model for audio denoising jobs"""
     __tablename__ = "denoise_jobs"
 
-    id = Column(Integer, primary_key=True, index=True)
-    input_path = Column(String, nullable=False)
-    output_path = Column(String, nullable=True)
-    status = Column(SQLEnum(ProcessingStatus, name="processing_status_enum"), default=ProcessingStatus.PENDING, nullable=False)
-    task_id = Column(String, nullable=True)
-    error_message = Column(Text, nullable=True)
-    stats = Column(JSONB, nullable=True)
-    parameters = Column(JSONB, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    completed_at = Column(DateTime, nullable=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    version: Mapped[int] = mapped_column(Integer, server_default="1", nullable=False)
+    input_path: Mapped[str] = mapped_column(String, nullable=False)
+    output_path: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    status: Mapped[ProcessingStatus] = mapped_column(
+        SQLEnum(ProcessingStatus, name="processing_status_enum"),
+        server_default=ProcessingStatus.PENDING.name,
+        nullable=False,
+        index=True
+    )
+    task_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    stats: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    parameters: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": version}
 
     def __repr__(self):
-        return f"<DenoiseJob(id={self.id}, status={self.status})>"
\ No newline at end of file
+        return f"<DenoiseJob(id={self.id}, status={self.status})>"
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Annotated, Optional, List, Dict, Any
 from enum import Enum
 
 class ProcessingStatus(str, Enum):
@@ -28,20 +28,20 @@ class Voice(VoiceBase):
     file_path: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class CloningJobCreate(BaseModel):
     voice_id: int
     input_text: str = Field(..., min_length=1, max_length=5000, description="Text to be converted to speech")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "voice_id": 1,
                 "input_text": "Hello world, this is a test message."
             }
         }
+    )
 
 class CloningJob(BaseModel):
     id: int
@@ -52,8 +52,7 @@ class CloningJob(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class TranslationJobCreate(BaseModel):
     target_language: str = Field(..., min_length=2, max_length=5)
@@ -70,32 +69,26 @@ class TranslationJob(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class DenoiseRequest(BaseModel):
-    vad_threshold: Optional[float] = Field(0.5, ge=0.0, le=1.0)
+    vad_threshold: Optional[Annotated[float, Field(ge=0.0, le=1.0)]] = 0.5
 
-    @validator('vad_threshold')
-    def validate_threshold(cls, v):
-        if not 0.0 <= v <= 1.0:
-            raise ValueError("VAD threshold must be between 0.0 and 1.0")
-        return v
-
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "vad_threshold": 0.5
             }
         }
+    )
 
 class DenoiseResponse(BaseModel):
     status: str
     output_url: str
     stats: Dict[str, Any]
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "status": "success",
                 "output_url": "https://storage.example.com/denoised/audio_denoised.wav",
@@ -108,6 +101,7 @@ class DenoiseResponse(BaseModel):
                 }
             }
         }
+    )
 
 class DenoiseJob(BaseModel):
     """Schema for denoising job responses"""
@@ -123,11 +117,7 @@ class DenoiseJob(BaseModel):
     completed_at: Optional[datetime] = None
     output_url: Optional[str] = None  # For presigned URLs
 
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
+    model_config = ConfigDict(from_attributes=True)
 
 class SpectralDenoiseRequest(BaseModel):
     stationary: bool = Field(True, description="Whether to use stationary noise reduction")
@@ -136,8 +126,8 @@ class SpectralDenoiseRequest(BaseModel):
     freq_mask_smooth_hz: int = Field(500, gt=0, description="Frequency mask smoothing in Hz")
     time_mask_smooth_ms: int = Field(50, gt=0, description="Time mask smoothing in ms")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "stationary": True,
                 "prop_decrease": 1.0,
@@ -145,4 +135,5 @@ class SpectralDenoiseRequest(BaseModel):
                 "freq_mask_smooth_hz": 500,
                 "time_mask_smooth_ms": 50
             }
-        }
\ No newline at end of file
+        }
+    )
\ No newline at end of file
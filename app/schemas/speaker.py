@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict
 from datetime import datetime
 from enum import Enum
@@ -22,8 +22,8 @@ class SpeakerJobCreate(BaseModel):
     num_speakers: Optional[int] = Field(None, ge=1, le=20, description="Optional: number of speakers to detect")
     parameters: Optional[Dict] = Field(None, description="Additional processing parameters")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "job_type": "diarization",
                 "num_speakers": 3,
@@ -33,6 +33,7 @@ class SpeakerJobCreate(BaseModel):
                 }
             }
         }
+    )
 
 class SpeakerJobResponse(BaseModel):
     id: int
@@ -44,8 +45,7 @@ class SpeakerJobResponse(BaseModel):
     result: Optional[Dict] = None
     error: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class DiarizationResult(BaseModel):
     speakers: List[SpeakerInfo]
@@ -53,8 +53,8 @@ class DiarizationResult(BaseModel):
     rttm_path: str = Field(..., description="Path to RTTM file")
     num_speakers: int = Field(..., description="Total number of speakers detected")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "speakers": [
                     {
@@ -73,6 +73,7 @@ class DiarizationResult(BaseModel):
                 "num_speakers": 3
             }
         }
+    )
 
 class ExtractionResult(BaseModel):
     num_speakers: int = Field(..., description="Number of speakers extracted")
@@ -80,8 +81,8 @@ class ExtractionResult(BaseModel):
     rttm_path: str = Field(..., description="Path to RTTM file")
     speaker_stats: Optional[List[SpeakerInfo]] = Field(None, description="Optional speaker statistics")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "num_speakers": 3,
                 "audio_files": [
@@ -99,6 +100,7 @@ class ExtractionResult(BaseModel):
                 ]
             }
         }
+    )
 
 class SpeakerAnalysisMetrics(BaseModel):
     """Optional metrics for speaker analysis results"""
@@ -107,8 +109,8 @@ class SpeakerAnalysisMetrics(BaseModel):
     noise_level: float = Field(..., ge=0, description="Background noise level in dB")
     signal_quality: Dict[str, float] = Field(..., description="Audio quality metrics")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "confidence_scores": {
                     "SPEAKER_00": 0.95,
@@ -121,4 +123,5 @@ class SpeakerAnalysisMetrics(BaseModel):
                     "clarity": 0.85
                 }
             }
-        } 
\ No newline at end of file
+        }
+    )
@@ -1,38 +1,69 @@
 import torch
-import torchaudio
+import torch.nn.functional as F
 from denoiser import pretrained
-from denoiser.dsp import convert_audio
 import numpy as np
 import logging
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, NamedTuple, Optional, Tuple
 from pathlib import Path
-import tempfile
-from functools import wraps
+from functools import lru_cache, wraps
+from app.core.config import get_settings
 from app.core.errors import DenoiserError, ErrorCodes
 from app.db.session import AsyncSessionLocal
 from app.models.audio import DenoiseJob, ProcessingStatus
 from app.services.storage_service import StorageService
-import gc
 import os
 import soundfile as sf
+import soxr
 import subprocess
+import threading
 from pydub import AudioSegment
 import io
+import json
 from app.core.constants import MAX_AUDIO_SIZE, MIN_AUDIO_DURATION, MAX_AUDIO_DURATION, SUPPORTED_AUDIO_FORMATS, SUPPORTED_AUDIO_EXTENSIONS, PROCESSING_SAMPLE_RATE, PROCESSING_CHANNELS, PROCESSING_FORMAT
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# soxr filter tables are built once per (in_rate, out_rate, channels) and reused
+_RESAMPLERS: Dict[Tuple[int, int, int], soxr.ResampleStream] = {}
+_RESAMPLER_LOCK = threading.Lock()
+
+def _resample(data: np.ndarray, in_rate: int, out_rate: int) -> np.ndarray:
+    """Resample [frames, channels] float32 audio with a cached soxr stream"""
+    key = (in_rate, out_rate, data.shape[1])
+    with _RESAMPLER_LOCK:
+        stream = _RESAMPLERS.get(key)
+        if stream is None:
+            stream = _RESAMPLERS[key] = soxr.ResampleStream(
+                in_rate, out_rate, data.shape[1], dtype="float32", quality="HQ"
+            )
+        else:
+            stream.clear()
+        return stream.resample_chunk(data, last=True)
+
+@lru_cache(maxsize=1)
+def _dns64_host_state() -> Dict[str, torch.Tensor]:
+    """DNS64 weights in host memory, loaded from disk once per process"""
+    return pretrained.dns64().state_dict()
+
+def preload_denoiser_weights():
+    """Load DNS64 weights before the worker pool forks so children inherit them"""
+    _dns64_host_state()
+
+class AudioProbe(NamedTuple):
+    sample_rate: int
+    channels: int
+    subtype: str
+    format: str
+    frames: int
 
 def optimize_array_processing(func):
     """Decorator to optimize array processing operations"""
     @wraps(func)
     async def wrapper(*args, **kwargs):
         try:
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            result = await func(*args, **kwargs)
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            return result
+            return await func(*args, **kwargs)
         except Exception as e:
             logger.error(f"Error in array processing: {str(e)}")
             raise
@@ -52,14 +83,15 @@ class DenoiserService:
     def _initialize(self):
         """Initialize service"""
         try:
+            # Let the caching allocator grow segments instead of fragmenting
+            os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+            
             # Load model based on available hardware
             device = "cuda" if torch.cuda.is_available() else "cpu"
             logger.info(f"Initializing Denoiser model on {device}")
             
             try:
-                self._model = pretrained.dns64()
-                self._model = self._model.to(device)
-                self._model.eval()
+                self._model = self._load_model(device)
             except Exception as e:
                 logger.error(f"Failed to load DNS64 model: {str(e)}")
                 self.initialized = False
@@ -70,6 +102,20 @@ class DenoiserService:
                 )
             
             self.device = device
+            # bf16 keeps fp32 range on Ampere+; fall back to fp16 on older GPUs
+            self._autocast_dtype = (
+                torch.bfloat16
+                if device == "cuda" and torch.cuda.is_bf16_supported()
+                else torch.float16
+            )
+            self._compiled = False
+            self._graph = None
+            # On CPU the inductor compile and warmup cost more than they save
+            if settings.DENOISER_COMPILE and device == "cuda":
+                self._compile_model()
+            # reduce-overhead compilation already replays CUDA graphs
+            if settings.DENOISER_CUDA_GRAPH and device == "cuda" and not self._compiled:
+                self._capture_graph()
             self.storage_service = StorageService()
             self.initialized = True
             logger.info(f"Denoiser initialized successfully on {device}")
@@ -82,97 +128,179 @@ class DenoiserService:
             self.storage_service = None
             # Don't raise here, just log the error and set initialized to False
 
+    @staticmethod
+    def _load_model(device: str) -> torch.nn.Module:
+        """Build DNS64 from the host-memory weights and copy them to the device"""
+        state = _dns64_host_state()
+        model = pretrained.dns64(pretrained=False)
+        if device == "cuda":
+            # Pinned source tensors let the H2D copy run asynchronously
+            state = {name: tensor.pin_memory() for name, tensor in state.items()}
+        model.load_state_dict(state, assign=True)
+        return model.to(device, non_blocking=True).eval()
+
+    def _compile_model(self):
+        """Compile the model and trigger compilation with a warmup batch"""
+        eager_model = self._model
+        try:
+            self._model = torch.compile(eager_model, mode="reduce-overhead", fullgraph=False)
+            chunk_size = settings.DENOISER_CHUNK_SIZE * eager_model.sample_rate
+            warmup = torch.zeros(
+                settings.DENOISER_BATCH_SIZE, eager_model.chin, chunk_size,
+                device=self.device
+            )
+            with torch.inference_mode(), torch.autocast(
+                device_type="cuda",
+                dtype=self._autocast_dtype,
+                enabled=self.device == "cuda"
+            ):
+                self._model(warmup)
+            self._compiled = True
+            logger.info("Denoiser model compiled")
+        except Exception as e:
+            logger.warning(f"torch.compile failed, using eager model: {e}")
+            self._model = eager_model
+
+    def _capture_graph(self):
+        """Capture the full-batch forward pass as a CUDA graph"""
+        chunk_size = settings.DENOISER_CHUNK_SIZE * self._model.sample_rate
+        static_in = torch.zeros(
+            settings.DENOISER_BATCH_SIZE, self._model.chin, chunk_size,
+            device=self.device
+        )
+        try:
+            with torch.inference_mode(), torch.autocast(
+                device_type="cuda", dtype=self._autocast_dtype, cache_enabled=False
+            ):
+                # Warm up on a side stream before capture, as CUDA graphs require
+                side_stream = torch.cuda.Stream()
+                side_stream.wait_stream(torch.cuda.current_stream())
+                with torch.cuda.stream(side_stream):
+                    for _ in range(3):
+                        self._model(static_in)
+                torch.cuda.current_stream().wait_stream(side_stream)
+                
+                graph = torch.cuda.CUDAGraph()
+                with torch.cuda.graph(graph):
+                    static_out = self._model(static_in)
+            
+            self._graph = graph
+            self._static_in = static_in
+            self._static_out = static_out
+            logger.info("Denoiser CUDA graph captured")
+        except Exception as e:
+            logger.warning(f"CUDA graph capture failed, using eager model: {e}")
+            self._graph = None
+
     @optimize_array_processing
     async def process_audio(
         self,
         input_path: str,
         output_path: str
     ) -> Dict[str, Any]:
-        """Process audio file with Denoiser"""
-        temp_input = None
-        temp_output = None
+        """Process audio file with Denoiser, streaming PCM through ffmpeg pipes"""
+        sample_rate = self._model.sample_rate
+        channels = self._model.chin
+        chunk_size = settings.DENOISER_CHUNK_SIZE * sample_rate
+        block_bytes = chunk_size * settings.DENOISER_BATCH_SIZE * channels * 4
+        decoder = None
+        encoder = None
         
         try:
-            # Create temporary files for format conversion
-            temp_input = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-            temp_output = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-            
-            # Convert input to proper format
-            audio_info = await self.convert_audio_format(input_path, temp_input.name)
-            
-            # Process with existing code
-            result = await self._process_audio(temp_input.name, temp_output.name)
-            
-            # Convert output back if needed
-            await self.convert_audio_format(temp_output.name, output_path)
-            
-            # Update stats with audio info
-            result["stats"].update(audio_info)
-            
-            return result
-            
-        finally:
-            # Cleanup temp files
-            for temp_file in [temp_input, temp_output]:
-                if temp_file:
-                    try:
-                        temp_file.close()
-                        if os.path.exists(temp_file.name):
-                            os.unlink(temp_file.name)
-                    except Exception as e:
-                        logger.warning(f"Failed to cleanup temp file: {e}")
-
-    async def _process_audio(self, input_path: str, output_path: str) -> Dict[str, Any]:
-        """Internal audio processing method"""
-        try:
-            # Load audio file
-            wav, sr = torchaudio.load(input_path)
-            
-            # Convert to model format
-            wav = convert_audio(
-                wav.to(self.device), 
-                sr, 
-                self._model.sample_rate, 
-                self._model.chin
+            # Decode straight to the model's rate/channels as raw float32
+            decoder = await asyncio.create_subprocess_exec(
+                'ffmpeg', '-hide_banner', '-loglevel', 'error', '-nostdin',
+                '-threads', '0', '-i', input_path, '-vn',
+                '-ac', str(channels), '-ar', str(sample_rate),
+                '-f', 'f32le', '-',
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            encoder = await asyncio.create_subprocess_exec(
+                'ffmpeg', '-hide_banner', '-loglevel', 'error', '-threads', '0', '-y',
+                '-f', 'f32le', '-ar', str(sample_rate), '-ac', str(channels), '-i', '-',
+                '-ar', str(PROCESSING_SAMPLE_RATE), '-ac', str(PROCESSING_CHANNELS),
+                '-af', 'aresample=resampler=soxr',
+                output_path,
+                stdin=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
             
-            # Process in chunks if audio is too long
-            chunk_size = 10 * self._model.sample_rate  # 10 second chunks
-            denoised_chunks = []
-            
-            with torch.no_grad():
-                for i in range(0, wav.shape[1], chunk_size):
-                    chunk = wav[:, i:i + chunk_size]
-                    if chunk.shape[1] < 100:  # Skip very small chunks
-                        continue
-                        
-                    # Process chunk
-                    denoised_chunk = self._model(chunk[None])[0]
-                    denoised_chunks.append(denoised_chunk.cpu())
-                    
-                    # Clear GPU memory
-                    if self.device == "cuda":
-                        torch.cuda.empty_cache()
+            num_samples = 0
+            energy = torch.zeros(2, device=self.device)
+            use_cuda = self.device == "cuda"
+            # Double-buffered host staging, allocated once per file; pinned on CUDA
+            # so the D2H copy of block N overlaps compute of block N+1
+            block_samples = chunk_size * settings.DENOISER_BATCH_SIZE
+            host_in = [torch.empty(block_samples, channels, pin_memory=use_cuda) for _ in range(2)]
+            host_out = [torch.empty(block_samples, channels, pin_memory=use_cuda) for _ in range(2)]
+            if use_cuda:
+                copy_stream = torch.cuda.Stream()
+            pending = None
+            slot = 0
             
-            # Combine chunks
-            denoised = torch.cat(denoised_chunks, dim=1)
+            while True:
+                try:
+                    buf = await decoder.stdout.readexactly(block_bytes)
+                except asyncio.IncompleteReadError as e:
+                    buf = e.partial[:len(e.partial) - len(e.partial) % (4 * channels)]
+                if not buf:
+                    break
+                
+                # Interleaved [samples, chin] -> [chin, samples]
+                samples = np.frombuffer(buf, dtype=np.float32).reshape(-1, channels)
+                n = samples.shape[0]
+                staged = host_in[slot][:n]
+                staged.numpy()[:] = samples
+                block = staged.T.to(self.device, non_blocking=True)
+                
+                denoised = self._denoise_block(block, chunk_size)
+                energy += self._energy(block, denoised)
+                num_samples += n
+                
+                if use_cuda:
+                    copy_stream.wait_stream(torch.cuda.current_stream())
+                    with torch.cuda.stream(copy_stream):
+                        out = host_out[slot][:n]
+                        out.copy_(denoised.T, non_blocking=True)
+                        done = torch.cuda.Event()
+                        done.record()
+                    denoised.record_stream(copy_stream)
+                else:
+                    out, done = host_out[slot][:n], None
+                    out.copy_(denoised.T)
+                
+                # Write the previous block while this one is still on the GPU
+                if pending:
+                    await self._write_block(encoder, *pending)
+                pending = (out, done)
+                slot ^= 1
+                
+                if len(buf) < block_bytes:
+                    break
             
-            # Save output
-            torchaudio.save(
-                output_path,
-                denoised.cpu(),
-                self._model.sample_rate
-            )
+            if pending:
+                await self._write_block(encoder, *pending)
+            encoder.stdin.close()
+            _, decode_err = await decoder.communicate()
+            _, encode_err = await encoder.communicate()
+            if decoder.returncode != 0 or encoder.returncode != 0 or num_samples == 0:
+                raise DenoiserError(
+                    message="Audio conversion failed",
+                    error_code=ErrorCodes.AUDIO_CONVERSION_FAILED,
+                    details={"error": (decode_err + encode_err).decode(errors="replace")}
+                )
             
-            # Calculate stats
+            noise_ss, signal_ss = energy.tolist()
+            duration = num_samples / sample_rate
             stats = {
-                "original_duration": wav.shape[1] / self._model.sample_rate,
-                "denoised_duration": denoised.shape[1] / self._model.sample_rate,
-                "sample_rate": self._model.sample_rate,
-                "noise_reduction_db": self._calculate_noise_reduction(
-                    wav.cpu().numpy(),
-                    denoised.cpu().numpy()
-                )
+                "original_duration": duration,
+                "denoised_duration": duration,
+                "sample_rate": PROCESSING_SAMPLE_RATE,
+                "noise_reduction_db": self._calculate_noise_reduction(noise_ss, signal_ss),
+                "duration": duration,
+                "channels": PROCESSING_CHANNELS,
+                "format": PROCESSING_FORMAT
             }
             
             return {
@@ -180,6 +308,8 @@ class DenoiserService:
                 "stats": stats
             }
             
+        except DenoiserError:
+            raise
         except Exception as e:
             logger.error(f"Failed to process audio: {str(e)}")
             raise DenoiserError(
@@ -188,23 +318,73 @@ class DenoiserService:
                 details={"error": str(e)}
             )
         finally:
-            # Clear memory
-            if self.device == "cuda":
-                torch.cuda.empty_cache()
-            gc.collect()
+            for process in (decoder, encoder):
+                if process and process.returncode is None:
+                    process.kill()
+                    await process.wait()
+
+    @staticmethod
+    async def _write_block(
+        encoder: asyncio.subprocess.Process,
+        out: torch.Tensor,
+        done: Optional[torch.cuda.Event]
+    ):
+        """Wait for a block's device-to-host copy and pipe it to the encoder"""
+        if done is not None:
+            done.synchronize()
+        encoder.stdin.write(out.numpy().tobytes())
+        await encoder.stdin.drain()
 
-    def _calculate_noise_reduction(
-        self, 
-        original: np.ndarray, 
-        denoised: np.ndarray
-    ) -> float:
-        """Calculate noise reduction in dB"""
-        noise = original - denoised
-        noise_rms = np.sqrt(np.mean(noise ** 2))
-        signal_rms = np.sqrt(np.mean(denoised ** 2))
+    def _denoise_block(self, block: torch.Tensor, chunk_size: int) -> torch.Tensor:
+        """Denoise a [chin, samples] block in fixed-size chunks"""
+        # Split into chunks, zero-padding the tail: [N, chin, chunk_size]
+        num_samples = block.shape[1]
+        pad = (-num_samples) % chunk_size
+        batched = F.pad(block, (0, pad)).view(block.shape[0], -1, chunk_size).transpose(0, 1)
         
-        if noise_rms > 0:
-            return float(20 * np.log10(signal_rms / noise_rms))
+        if self._graph is not None and batched.shape[0] == self._static_in.shape[0]:
+            # Full batches replay the captured graph; the ragged tail runs eagerly
+            self._static_in.copy_(batched)
+            self._graph.replay()
+            denoised = self._static_out.clone()
+        else:
+            with torch.inference_mode(), torch.autocast(
+                device_type="cuda",
+                dtype=self._autocast_dtype,
+                enabled=self.device == "cuda"
+            ):
+                denoised = self._model(batched.contiguous())
+            if self._compiled and self.device == "cuda":
+                # reduce-overhead outputs live in the cudagraph pool; the next replay
+                # would overwrite them while the D2H copy is still reading
+                denoised = denoised.clone()
+        
+        # Stitch chunks back together and drop the padding
+        denoised = denoised.transpose(0, 1).reshape(block.shape[0], -1)
+        return denoised[:, :num_samples].float()
+
+    @staticmethod
+    def _energy(original: torch.Tensor, denoised: torch.Tensor) -> torch.Tensor:
+        """Sums of squares of the removed noise and of the denoised signal"""
+        return torch.stack([
+            torch.linalg.vector_norm(original - denoised) ** 2,
+            torch.linalg.vector_norm(denoised) ** 2
+        ])
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _probe_cached(path: str, mtime_ns: int, size: int) -> Optional[AudioProbe]:
+        """Read audio header information without decoding, keyed on file identity"""
+        try:
+            with sf.SoundFile(path) as f:
+                return AudioProbe(f.samplerate, f.channels, f.subtype, f.format, f.frames)
+        except Exception:
+            return None
+
+    def _calculate_noise_reduction(self, noise_ss: float, signal_ss: float) -> float:
+        """Calculate noise reduction in dB from sums of squares"""
+        if noise_ss > 0:
+            return float(10 * np.log10(signal_ss / noise_ss))
         return 0.0
 
     async def get_job_status(self, job_id: int) -> Dict[str, Any]:
@@ -246,38 +426,35 @@ class DenoiserService:
     async def convert_audio_format(self, input_path: str, output_path: str) -> Dict[str, Any]:
         """Convert audio to the required format for processing"""
         try:
-            # Try using pydub first for better format support
+            # libsndfile + soxr handle wav/flac/ogg (and mp3 on recent libsndfile)
             try:
-                audio = AudioSegment.from_file(input_path)
+                data, sr = sf.read(input_path, dtype="float32", always_2d=True)
+                channels = data.shape[1]
                 
                 # Convert to mono if needed
-                if audio.channels > 1:
-                    audio = audio.set_channels(PROCESSING_CHANNELS)
+                if channels > PROCESSING_CHANNELS:
+                    data = data.mean(axis=1, keepdims=True)
                 
                 # Set sample rate
-                if audio.frame_rate != PROCESSING_SAMPLE_RATE:
-                    audio = audio.set_frame_rate(PROCESSING_SAMPLE_RATE)
+                if sr != PROCESSING_SAMPLE_RATE:
+                    data = _resample(data, sr, PROCESSING_SAMPLE_RATE)
                 
-                # Export as WAV
-                audio.export(output_path, format=PROCESSING_FORMAT, parameters=[
-                    "-acodec", "pcm_s16le",  # Force 16-bit PCM encoding
-                    "-ar", str(PROCESSING_SAMPLE_RATE),
-                    "-ac", str(PROCESSING_CHANNELS)
-                ])
+                sf.write(output_path, data, PROCESSING_SAMPLE_RATE, subtype="PCM_16")
                 
                 return {
-                    "duration": len(audio) / 1000.0,
-                    "sample_rate": audio.frame_rate,
-                    "channels": audio.channels,
+                    "duration": data.shape[0] / PROCESSING_SAMPLE_RATE,
+                    "sample_rate": PROCESSING_SAMPLE_RATE,
+                    "channels": data.shape[1],
                     "format": "wav"
                 }
                 
-            except Exception as e:
-                logger.warning(f"Pydub conversion failed, trying FFmpeg: {e}")
+            except sf.LibsndfileError as e:
+                logger.warning(f"libsndfile cannot decode input, trying FFmpeg: {e}")
                 
                 # Fallback to FFmpeg with more explicit parameters
                 cmd = [
-                    'ffmpeg', '-y',
+                    'ffmpeg', '-hide_banner', '-loglevel', 'error', '-nostdin',
+                    '-threads', '0', '-y',
                     '-i', input_path,
                     '-vn',  # No video
                     '-acodec', 'pcm_s16le',  # Force 16-bit PCM
@@ -287,18 +464,13 @@ class DenoiserService:
                     output_path
                 ]
                 
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
-                stdout, stderr = process.communicate()
+                process = subprocess.run(cmd, capture_output=True)
                 
                 if process.returncode != 0:
                     raise DenoiserError(
                         message="Audio conversion failed",
                         error_code=ErrorCodes.AUDIO_CONVERSION_FAILED,
-                        details={"error": stderr.decode()}
+                        details={"error": process.stderr.decode()}
                     )
                 
                 # Verify the converted file
@@ -317,18 +489,42 @@ class DenoiserService:
                 details={"error": str(e)}
             )
 
+    @staticmethod
+    def _ffprobe(path: str) -> Optional[Dict[str, Any]]:
+        """Read audio stream metadata from the container with ffprobe"""
+        try:
+            output = subprocess.check_output([
+                'ffprobe', '-v', 'error', '-select_streams', 'a:0',
+                '-show_entries', 'stream=sample_rate,channels,duration:format=duration,format_name',
+                '-of', 'json', path
+            ])
+            info = json.loads(output)
+            stream = info["streams"][0]
+            duration = stream.get("duration") or info["format"]["duration"]
+            return {
+                "duration": float(duration),
+                "sample_rate": int(stream["sample_rate"]),
+                "channels": int(stream["channels"]),
+                "format": info["format"].get("format_name")
+            }
+        except Exception as e:
+            logger.debug(f"ffprobe could not read {path}: {e}")
+            return None
+
     def validate_audio_file(self, file_path: str) -> Dict[str, Any]:
         """Validate audio file before processing"""
         try:
             # Check file exists
-            if not os.path.exists(file_path):
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
                 raise DenoiserError(
                     message="Audio file not found",
                     error_code=ErrorCodes.NOT_FOUND
                 )
                 
             # Check file size
-            file_size = os.path.getsize(file_path)
+            file_size = stat.st_size
             if file_size > MAX_AUDIO_SIZE:
                 raise DenoiserError(
                     message="Audio file too large",
@@ -336,18 +532,22 @@ class DenoiserService:
                     details={"max_size": MAX_AUDIO_SIZE, "file_size": file_size}
                 )
                 
-            # Try to read file with soundfile first
-            try:
-                with sf.SoundFile(file_path) as f:
-                    duration = float(len(f)) / f.samplerate
-                    audio_info = {
-                        "duration": duration,
-                        "sample_rate": f.samplerate,
-                        "channels": f.channels,
-                        "format": f.format
-                    }
-            except Exception:
-                # If soundfile fails, try pydub
+            # Try to read file header with soundfile first
+            probe = self._probe_cached(file_path, stat.st_mtime_ns, file_size)
+            if probe is not None:
+                duration = float(probe.frames) / probe.sample_rate
+                audio_info = {
+                    "duration": duration,
+                    "sample_rate": probe.sample_rate,
+                    "channels": probe.channels,
+                    "format": probe.format
+                }
+            else:
+                audio_info = self._ffprobe(file_path)
+                duration = audio_info["duration"] if audio_info else None
+            
+            if audio_info is None:
+                # Last resort: decode with pydub
                 try:
                     audio = AudioSegment.from_file(file_path)
                     duration = len(audio) / 1000.0  # Convert ms to seconds
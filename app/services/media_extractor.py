@@ -1,14 +1,27 @@
 from yt_dlp import YoutubeDL
-import requests
+import aiohttp
+import aiofiles
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import tempfile
 from typing import Optional, Tuple
+from app.core.config import get_settings
 from app.core.errors import AudioProcessingError, ErrorCodes, ErrorCategory, ErrorSeverity
 import logging
 from urllib.parse import urlparse
 import magic
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+MAGIC_HEADER_SIZE = 4096
+
+# libmagic handles are expensive to open; share one per process
+_MAGIC = magic.Magic(mime=True)
 
 class MediaExtractor:
     SUPPORTED_DOMAINS = {
@@ -27,8 +40,14 @@ class MediaExtractor:
             }],
             'outtmpl': '%(id)s.%(ext)s',
             'quiet': True,
-            'no_warnings': True
+            'no_warnings': True,
+            # Persist extractor caches (signatures, player JS) across runs
+            'cachedir': str(Path(settings.DOWNLOAD_DIR) / '.ytdl-cache'),
+            'sleep_requests': 1
         }
+        # YoutubeDL keeps per-download state, so each pool thread builds and reuses its own
+        self._ydl_local = threading.local()
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ydl-io')
 
     async def extract_audio(self, source: str) -> Tuple[str, str]:
         """Extract audio from various sources (URL or direct file)"""
@@ -64,10 +83,9 @@ class MediaExtractor:
     async def _extract_social_media(self, url: str) -> Tuple[str, str]:
         with tempfile.TemporaryDirectory() as temp_dir:
             try:
-                with YoutubeDL(self.ydl_opts) as ydl:
-                    info = ydl.extract_info(url, download=True)
-                    filename = ydl.prepare_filename(info).replace('.webm', '.wav')
-                    return filename, 'audio/wav'
+                loop = asyncio.get_running_loop()
+                filename = await loop.run_in_executor(self._io_pool, self._download_with_ydl, url)
+                return filename, 'audio/wav'
             except Exception as e:
                 raise AudioProcessingError(
                     message=f"Failed to extract from social media: {str(e)}",
@@ -77,33 +95,45 @@ class MediaExtractor:
                     original_error=e
                 )
 
+    def _get_ydl(self) -> YoutubeDL:
+        """This thread's YoutubeDL; building one loads every extractor class"""
+        ydl = getattr(self._ydl_local, 'ydl', None)
+        if ydl is None:
+            ydl = self._ydl_local.ydl = YoutubeDL(self.ydl_opts)
+        return ydl
+
+    def _download_with_ydl(self, url: str) -> str:
+        ydl = self._get_ydl()
+        info = ydl.extract_info(url, download=True)
+        return ydl.prepare_filename(info).replace('.webm', '.wav')
+
     async def _download_direct_audio(self, url: str) -> Tuple[str, str]:
+        suffix = Path(urlparse(url).path).suffix or '.tmp'
+        fd, temp_path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        
         try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
+            head = b''
+            mime_type = None
+            async with aiohttp.ClientSession(raise_for_status=True) as session:
+                async with session.get(url) as response:
+                    async with aiofiles.open(temp_path, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            await f.write(chunk)
+                            
+                            # Sniff the mime type as soon as the header has arrived
+                            if mime_type is None:
+                                head += chunk
+                                if len(head) >= MAGIC_HEADER_SIZE:
+                                    mime_type = self._check_audio_mime(head)
             
-            # Create temporary file
-            suffix = Path(urlparse(url).path).suffix or '.tmp'
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+            if mime_type is None:
+                mime_type = self._check_audio_mime(head)
             
-            # Download file
-            for chunk in response.iter_content(chunk_size=8192):
-                temp_file.write(chunk)
-            temp_file.close()
-            
-            # Detect mime type
-            mime_type = magic.from_file(temp_file.name, mime=True)
-            
-            if not mime_type.startswith('audio/'):
-                raise AudioProcessingError(
-                    message="URL does not point to an audio file",
-                    error_code=ErrorCodes.INVALID_AUDIO_FORMAT,
-                    category=ErrorCategory.VALIDATION
-                )
+            return temp_path, mime_type
             
-            return temp_file.name, mime_type
-            
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
+            Path(temp_path).unlink(missing_ok=True)
             raise AudioProcessingError(
                 message=f"Failed to download audio: {str(e)}",
                 error_code=ErrorCodes.DOWNLOAD_FAILED,
@@ -111,9 +141,23 @@ class MediaExtractor:
                 severity=ErrorSeverity.MEDIUM,
                 original_error=e
             )
+        except Exception:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def _check_audio_mime(self, head: bytes) -> str:
+        mime_type = _MAGIC.from_buffer(head)
+        if not mime_type.startswith('audio/'):
+            raise AudioProcessingError(
+                message="URL does not point to an audio file",
+                error_code=ErrorCodes.INVALID_AUDIO_FORMAT,
+                category=ErrorCategory.VALIDATION
+            )
+        return mime_type
 
     async def _handle_direct_file(self, file_path: str) -> Tuple[str, str]:
-        mime_type = magic.from_file(file_path, mime=True)
+        with open(file_path, 'rb') as f:
+            mime_type = _MAGIC.from_buffer(f.read(MAGIC_HEADER_SIZE))
         if not mime_type.startswith('audio/'):
             raise AudioProcessingError(
                 message="File is not an audio file",
@@ -0,0 +1,39 @@
+import os
+import logging
+from functools import lru_cache
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# huggingface_hub reads this once at import, so it has to be exported before pyannote loads
+if settings.HF_HUB_OFFLINE:
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+import torch
+from pyannote.audio import Pipeline
+from app.core.device import default_pipeline_batch_size
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=2)
+def load_pipeline(checkpoint: str) -> Pipeline:
+    """Load a pyannote pipeline once per process and move it to the GPU if available"""
+    pipeline = Pipeline.from_pretrained(
+        checkpoint,
+        use_auth_token=settings.HF_TOKEN,
+        cache_dir=settings.HF_CACHE_DIR
+    )
+    if pipeline is None:
+        raise RuntimeError(f"Could not load pipeline {checkpoint}")
+
+    default_batch_size = default_pipeline_batch_size()
+    pipeline.embedding_batch_size = settings.SPEAKER_EMBEDDING_BATCH_SIZE or default_batch_size
+    pipeline.segmentation_batch_size = settings.SPEAKER_SEGMENTATION_BATCH_SIZE or default_batch_size
+
+    if torch.cuda.is_available():
+        pipeline = pipeline.to(torch.device("cuda"))
+        logger.info(f"Pipeline {checkpoint} moved to GPU: {torch.cuda.get_device_name(0)}")
+    else:
+        logger.info(f"Pipeline {checkpoint} using CPU for inference")
+
+    return pipeline
@@ -1,11 +1,14 @@
-from pyannote.audio import Pipeline
-from huggingface_hub import hf_hub_download
+from pyannote.audio import Audio, Pipeline
 import torch
-import torchaudio
+import asyncio
+import codecs
 import io
 import logging
+from collections import defaultdict
 from typing import Dict, Any, Tuple
 from app.core.config import get_settings
+from app.core.device import to_device_async
+from app.services.pipeline_loader import load_pipeline
 from app.services.storage_service import StorageService
 from app.core.errors import AudioProcessingError
 from pyannote.audio.pipelines.utils.hook import ProgressHook
@@ -16,32 +19,39 @@ settings = get_settings()
 class SpeakerDiarizationService:
     """Service for speaker diarization using pyannote/speaker-diarization-3.1"""
     
-    def __init__(self):
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            # Only publish the instance once the pipeline has loaded
+            instance = super(SpeakerDiarizationService, cls).__new__(cls)
+            instance._initialize()
+            cls._instance = instance
+        return cls._instance
+
+    def _initialize(self):
+        """Initialize service"""
         self.storage = StorageService()
         self.hf_token = settings.HF_TOKEN
         if not self.hf_token:
             raise ValueError("HF_TOKEN environment variable is not set")
         
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self._h2d_stream = torch.cuda.Stream() if torch.cuda.is_available() else None
+        # Decode, downmix and resample in one step
+        self._audio = Audio(mono="downmix", sample_rate=settings.AUDIO_SAMPLE_RATE)
         self.pipeline = self._initialize_pipeline()
 
-    def __del__(self):
-        if hasattr(self, 'pipeline'):
-            del self.pipeline
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-
     def _initialize_pipeline(self) -> Pipeline:
         """Initialize the pyannote diarization pipeline"""
         try:
-            pipeline = Pipeline.from_pretrained(
-                "pyannote/speaker-diarization-3.1",
-                use_auth_token=self.hf_token
-            )
+            pipeline = load_pipeline("pyannote/speaker-diarization-3.1")
             
             if torch.cuda.is_available():
-                pipeline = pipeline.to(self.device)
                 logger.info(f"Using GPU: {torch.cuda.get_device_name(0)}")
+                if settings.SPEAKER_EMBEDDING_FP16:
+                    # Embedding frames run in fp16; statistics pooling stays fp32
+                    pipeline._embedding_precision = torch.float16
             
             return pipeline
         except Exception as e:
@@ -53,15 +63,15 @@ class SpeakerDiarizationService:
         try:
             # Download from storage
             audio_data = self.storage.download_file(input_path)
-            waveform, sample_rate = await self._load_audio(audio_data)
-            
-            # Resample if needed
-            if sample_rate != 16000:
-                waveform = await self._resample_audio(waveform, sample_rate, 16000)
-                sample_rate = 16000
+            waveform, sample_rate = await asyncio.to_thread(self._load_audio, audio_data)
+            waveform = to_device_async(waveform, self.device, self._h2d_stream)
 
             # Run diarization
-            with ProgressHook() as hook:
+            with torch.inference_mode(), torch.autocast(
+                device_type="cuda",
+                dtype=torch.float16,
+                enabled=self.device.type == "cuda" and settings.SPEAKER_AUTOCAST
+            ), ProgressHook() as hook:
                 if num_speakers:
                     diarization = self.pipeline(
                         {"waveform": waveform, "sample_rate": sample_rate},
@@ -83,32 +93,22 @@ class SpeakerDiarizationService:
                 "results": results
             }
 
+        except torch.cuda.OutOfMemoryError as e:
+            # Only hand cached blocks back to the driver when we actually ran out
+            torch.cuda.empty_cache()
+            logger.error(f"Audio processing ran out of GPU memory: {str(e)}")
+            raise AudioProcessingError(f"Failed to process audio: {str(e)}")
         except Exception as e:
             logger.error(f"Audio processing failed: {str(e)}")
             raise AudioProcessingError(f"Failed to process audio: {str(e)}")
-        finally:
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
 
-    async def _load_audio(self, audio_data: bytes) -> Tuple[torch.Tensor, int]:
-        """Load audio data into memory"""
+    def _load_audio(self, audio_data: bytes) -> Tuple[torch.Tensor, int]:
+        """Load audio as mono at the pipeline sample rate"""
         try:
-            with io.BytesIO(audio_data) as buffer:
-                waveform, sample_rate = torchaudio.load(buffer)
-                return waveform, sample_rate
+            return self._audio(io.BytesIO(audio_data))
         except Exception as e:
             raise AudioProcessingError(f"Failed to load audio: {str(e)}")
 
-    async def _resample_audio(
-        self, 
-        waveform: torch.Tensor, 
-        orig_sr: int, 
-        target_sr: int
-    ) -> torch.Tensor:
-        """Resample audio to target sample rate"""
-        resampler = torchaudio.transforms.Resample(orig_sr, target_sr)
-        return resampler(waveform)
-
     async def _save_results(
         self,
         job_id: int,
@@ -122,31 +122,29 @@ class SpeakerDiarizationService:
 
         # Save RTTM file
         rttm_path = f"processed/{job_id}/diarization.rttm"
-        rttm_buffer = io.StringIO()
-        diarization.write_rttm(rttm_buffer)
-        await self.storage.upload_file(
-            rttm_buffer.getvalue().encode(), 
+        rttm_buffer = io.BytesIO()
+        diarization.write_rttm(codecs.getwriter("utf-8")(rttm_buffer))
+        rttm_upload = asyncio.create_task(self.storage.upload_file(
+            rttm_buffer.getvalue(), 
             rttm_path
-        )
+        ))
         
-        # Process timeline
+        # Build timeline and per-speaker totals in a single pass
+        totals = defaultdict(float)
         for segment, track, speaker in diarization.itertracks(yield_label=True):
             results["timeline"].append({
                 "start": segment.start,
                 "end": segment.end,
                 "speaker": speaker
             })
+            totals[speaker] += segment.end - segment.start
         
         # Collect unique speakers
         for speaker in diarization.labels():
-            total_time = sum(
-                segment.end - segment.start
-                for segment, _, spk in diarization.itertracks(yield_label=True)
-                if spk == speaker
-            )
             results["speakers"].append({
                 "label": speaker,
-                "total_speaking_time": total_time
+                "total_speaking_time": totals[speaker]
             })
 
+        await rttm_upload
         return results
\ No newline at end of file
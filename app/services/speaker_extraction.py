@@ -1,67 +1,58 @@
-import os
-import tempfile
-import magic
-import subprocess
-from pydub import AudioSegment
+import asyncio
 from pyannote.audio import Pipeline
-from huggingface_hub import hf_hub_download
 import torch
 import torchaudio
-import scipy.io.wavfile as wavfile
+import soundfile as sf
+import codecs
 import io
+import math
 import logging
-from typing import Dict, Any, Tuple
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
 from app.core.config import get_settings
+from app.core.device import to_device_async
+from app.services.pipeline_loader import load_pipeline
 from app.services.storage_service import StorageService
 from app.core.errors import AudioProcessingError, ErrorCodes
 from pyannote.audio.pipelines.utils.hook import ProgressHook
 from app.core.metrics import SPEAKER_EXTRACTION_TIME, SPEAKER_COUNT
-import gc
 import numpy as np
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+@lru_cache(maxsize=8)
+def _get_resampler(orig_sr: int, target_sr: int, device: torch.device) -> torchaudio.transforms.Resample:
+    """Resampler for a rate pair, built once per process since the sinc kernel is costly"""
+    return torchaudio.transforms.Resample(orig_sr, target_sr).to(device)
+
 class SpeakerExtractionService:
-    def __init__(self):
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            # Only publish the instance once the pipeline has loaded
+            instance = super(SpeakerExtractionService, cls).__new__(cls)
+            instance._initialize()
+            cls._instance = instance
+        return cls._instance
+
+    def _initialize(self):
+        """Initialize service"""
         self.storage = StorageService()
         self.hf_token = settings.HF_TOKEN
         if not self.hf_token:
             raise ValueError("HF_TOKEN environment variable is not set")
         
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self._h2d_stream = torch.cuda.Stream() if torch.cuda.is_available() else None
         logger.info(f"Using device: {self.device}")
         self.pipeline = self._initialize_pipeline()
 
-    def __del__(self):
-        if hasattr(self, 'pipeline'):
-            del self.pipeline
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-
     def _initialize_pipeline(self) -> Pipeline:
         """Initialize the pyannote separation pipeline"""
         try:
-            model_path = hf_hub_download(
-                repo_id="pyannote/speech-separation-ami-1.0",
-                filename="config.yaml",
-                use_auth_token=self.hf_token
-            )
-            logger.info(f"Model downloaded to: {model_path}")
-            
-            pipeline = Pipeline.from_pretrained(
-                model_path,
-                use_auth_token=self.hf_token
-            )
-            
-            if torch.cuda.is_available():
-                pipeline = pipeline.to(self.device)
-                logger.info(f"Pipeline moved to GPU: {torch.cuda.get_device_name(0)}")
-            else:
-                logger.info("Using CPU for inference")
-            
-            return pipeline
-            
+            return load_pipeline("pyannote/speech-separation-ami-1.0")
         except Exception as e:
             logger.error(f"Pipeline initialization failed: {str(e)}")
             raise AudioProcessingError(
@@ -75,18 +66,23 @@ class SpeakerExtractionService:
             # Download audio file
             audio_data = await self.storage.download_file(input_path)
             waveform, sample_rate = await self._load_audio(audio_data)
+            waveform = to_device_async(waveform, self.device, self._h2d_stream)
             
             # Log GPU memory if available
             self._log_gpu_memory()
             
             # Resample if needed
             if sample_rate != settings.AUDIO_SAMPLE_RATE:
-                waveform = await self._resample_audio(waveform, sample_rate, settings.AUDIO_SAMPLE_RATE)
+                waveform = self._resample_audio(waveform, sample_rate, settings.AUDIO_SAMPLE_RATE)
                 sample_rate = settings.AUDIO_SAMPLE_RATE
 
             # Process with pipeline
             logger.info("Running pipeline...")
-            with ProgressHook() as hook:
+            with torch.inference_mode(), torch.autocast(
+                device_type="cuda",
+                dtype=torch.float16,
+                enabled=self.device.type == "cuda" and settings.SPEAKER_AUTOCAST
+            ), ProgressHook() as hook:
                 diarization, sources = self.pipeline({
                     "waveform": waveform,
                     "sample_rate": sample_rate
@@ -102,13 +98,16 @@ class SpeakerExtractionService:
             # Record metrics
             SPEAKER_COUNT.labels(job_type="extraction").observe(len(results["speakers"]))
             
-            # Cleanup
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            gc.collect()
-            
             return results
             
+        except torch.cuda.OutOfMemoryError as e:
+            # Only hand cached blocks back to the driver when we actually ran out
+            torch.cuda.empty_cache()
+            logger.error(f"Speaker extraction ran out of GPU memory: {str(e)}")
+            raise AudioProcessingError(
+                message=f"Failed to extract speakers: {str(e)}",
+                error_code=ErrorCodes.PROCESSING_FAILED
+            )
         except Exception as e:
             logger.error(f"Speaker extraction failed: {str(e)}")
             raise AudioProcessingError(
@@ -119,44 +118,29 @@ class SpeakerExtractionService:
     async def _load_audio(self, audio_data: bytes) -> Tuple[torch.Tensor, int]:
         """Load audio data with fallback methods"""
         try:
-            # Try torchaudio first
-            with io.BytesIO(audio_data) as buffer:
-                try:
-                    waveform, sample_rate = torchaudio.load(buffer)
-                    return waveform, sample_rate
-                except Exception as e:
-                    logger.warning(f"torchaudio load failed: {e}")
-
-            # Fallback to pydub/ffmpeg
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_path = temp_file.name
-
-            # Convert to WAV if needed
-            file_type = magic.from_file(temp_path, mime=True)
-            if not file_type.startswith('audio/x-wav'):
-                wav_path = f"{temp_path}_converted.wav"
-                subprocess.run([
-                    'ffmpeg', '-i', temp_path,
-                    '-acodec', 'pcm_s16le',
-                    '-ar', str(settings.AUDIO_SAMPLE_RATE),
-                    wav_path
-                ], check=True, capture_output=True)
-                os.remove(temp_path)
-                temp_path = wav_path
+            # Fast path: decode in-process with libsndfile, off the event loop
+            try:
+                return await asyncio.to_thread(self._decode_audio, audio_data)
+            except sf.LibsndfileError as e:
+                logger.warning(f"soundfile load failed: {e}")
 
-            # Load with pydub
-            audio = AudioSegment.from_wav(temp_path)
-            samples = torch.FloatTensor(audio.get_array_of_samples())
-            
-            # Handle channels
-            if audio.channels > 1:
-                samples = samples.view(-1, audio.channels).t()
-            else:
-                samples = samples.unsqueeze(0)
+            # Fallback: pipe through ffmpeg to mono float32 at the pipeline rate
+            process = await asyncio.create_subprocess_exec(
+                'ffmpeg', '-hide_banner', '-loglevel', 'error', '-nostdin',
+                '-i', 'pipe:0',
+                '-f', 'f32le', '-acodec', 'pcm_f32le',
+                '-ac', '1', '-ar', str(settings.AUDIO_SAMPLE_RATE),
+                'pipe:1',
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate(audio_data)
+            if process.returncode != 0:
+                raise RuntimeError(f"ffmpeg decode failed: {stderr.decode(errors='replace').strip()}")
 
-            os.remove(temp_path)
-            return samples, audio.frame_rate
+            samples = torch.from_numpy(np.frombuffer(stdout, dtype=np.float32).copy())
+            return samples.unsqueeze(0), settings.AUDIO_SAMPLE_RATE
 
         except Exception as e:
             raise AudioProcessingError(
@@ -164,15 +148,20 @@ class SpeakerExtractionService:
                 error_code=ErrorCodes.INVALID_AUDIO_FORMAT
             )
 
-    async def _resample_audio(
+    def _decode_audio(self, audio_data: bytes) -> Tuple[torch.Tensor, int]:
+        """Decode audio bytes with libsndfile into a (channels, frames) tensor"""
+        data, sample_rate = sf.read(io.BytesIO(audio_data), dtype="float32", always_2d=True)
+        return torch.from_numpy(np.ascontiguousarray(data.T)), sample_rate
+
+    def _resample_audio(
         self, 
         waveform: torch.Tensor, 
         orig_sr: int, 
         target_sr: int
     ) -> torch.Tensor:
-        """Resample audio to target sample rate"""
-        resampler = torchaudio.transforms.Resample(orig_sr, target_sr)
-        return resampler(waveform)
+        """Resample audio to target sample rate on the pipeline device"""
+        resampler = _get_resampler(orig_sr, target_sr, self.device)
+        return resampler(waveform.to(self.device, non_blocking=True))
 
     def _log_gpu_memory(self):
         """Log GPU memory usage"""
@@ -196,52 +185,46 @@ class SpeakerExtractionService:
 
         # Save RTTM file
         rttm_path = f"processed/{job_id}/extraction.rttm"
-        rttm_buffer = io.StringIO()
-        diarization.write_rttm(rttm_buffer)
-        await self.storage.upload_file(
-            rttm_buffer.getvalue().encode(), 
+        rttm_buffer = io.BytesIO()
+        diarization.write_rttm(codecs.getwriter("utf-8")(rttm_buffer))
+        upload_tasks = [asyncio.create_task(self.storage.upload_file(
+            rttm_buffer.getvalue(), 
             rttm_path
-        )
+        ))]
         results["files"].append({
             "type": "rttm",
             "path": rttm_path
         })
 
+        # Normalize every separated source in one batch on the pipeline device
+        pcm, original_rms, final_rms, peaks = self._normalize_sources(sources.data)
+
         # Process and save individual speaker audio
         for idx, speaker in enumerate(diarization.labels()):
             speaker_path = f"processed/{job_id}/speaker_{idx}.wav"
             
-            # Get speaker audio
-            speaker_audio = sources.data[:, idx]
-            if isinstance(speaker_audio, torch.Tensor):
-                speaker_audio = speaker_audio.cpu().numpy()
-            
-            # Apply audio normalization
-            normalized_audio = self._normalize_audio(speaker_audio)
-            
-            # Get audio stats for logging
-            original_rms = np.sqrt(np.mean(np.square(speaker_audio)))
-            final_rms = np.sqrt(np.mean(np.square(normalized_audio)))
             logger.info(
                 f"Speaker {idx} normalization - "
-                f"Original RMS: {20 * np.log10(original_rms):.2f} dB, "
-                f"Final RMS: {20 * np.log10(final_rms):.2f} dB"
+                f"Original RMS: {20 * np.log10(original_rms[idx]):.2f} dB, "
+                f"Final RMS: {20 * np.log10(final_rms[idx]):.2f} dB"
             )
             
             # Save normalized audio
             buffer = io.BytesIO()
-            wavfile.write(
+            sf.write(
                 buffer,
+                pcm[idx],
                 sample_rate,
-                (normalized_audio * np.iinfo(np.int16).max).astype(np.int16)
+                subtype="PCM_16",
+                format="WAV"
             )
             buffer.seek(0)
             
             # Upload to storage
-            await self.storage.upload_file(
+            upload_tasks.append(asyncio.create_task(self.storage.upload_file(
                 buffer.getvalue(),
                 speaker_path
-            )
+            )))
             
             # Add to results
             results["speakers"].append({
@@ -249,8 +232,8 @@ class SpeakerExtractionService:
                 "label": speaker,
                 "audio_path": speaker_path,
                 "audio_stats": {
-                    "rms_db": float(20 * np.log10(final_rms)),
-                    "peak": float(np.max(np.abs(normalized_audio)))
+                    "rms_db": float(20 * np.log10(final_rms[idx])),
+                    "peak": peaks[idx]
                 }
             })
             results["files"].append({
@@ -259,25 +242,40 @@ class SpeakerExtractionService:
                 "path": speaker_path
             })
 
+        await asyncio.gather(*upload_tasks)
         return results
 
-    def _normalize_audio(self, waveform: np.ndarray, target_db: float = -18.0) -> np.ndarray:
-        """Normalize audio using RMS normalization with peak limiting"""
-        # Calculate current RMS
-        rms = np.sqrt(np.mean(np.square(waveform)))
+    def _normalize_sources(
+        self,
+        sources: Any,
+        target_db: float = -18.0
+    ) -> Tuple[np.ndarray, List[float], List[float], List[float]]:
+        """Normalize separated sources using RMS normalization with peak limiting.
+
+        Takes a (frames, speakers) array and returns (speakers, frames) int16 PCM
+        together with each speaker's original RMS, final RMS and peak.
+        """
+        audio = torch.as_tensor(sources, dtype=torch.float32).to(self.device, non_blocking=True)
+        num_frames = max(audio.shape[0], 1)
+        
+        # Per-speaker RMS and peak without materializing squared/abs copies
+        original_rms = torch.linalg.vector_norm(audio, dim=0) / math.sqrt(num_frames)
+        input_peak = torch.linalg.vector_norm(audio, ord=float("inf"), dim=0)
         
         # Calculate target RMS (convert from dB)
         target_rms = 10 ** (target_db / 20.0)
         
-        # Calculate gain needed
-        gain = target_rms / (rms + 1e-6)  # Avoid division by zero
+        # Gain towards the target, capped so peaks keep 0.95 of headroom
+        gain = target_rms / (original_rms + 1e-6)
+        gain = torch.minimum(gain, 0.95 / input_peak.clamp_min(1e-12))
         
-        # Apply gain
-        normalized = waveform * gain
+        # Scale straight to int16 and transfer once
+        pcm = (audio * (gain * 32767.0)).round_().clamp_(-32768, 32767).to(torch.int16)
+        pcm = pcm.t().contiguous().cpu().numpy()
         
-        # Apply peak limiting to prevent clipping
-        max_peak = np.max(np.abs(normalized))
-        if max_peak > 0.95:  # Leave some headroom
-            normalized = normalized * (0.95 / max_peak)
-        
-        return normalized
\ No newline at end of file
+        return (
+            pcm,
+            original_rms.tolist(),
+            (original_rms * gain).tolist(),
+            (input_peak * gain).tolist()
+        )
@@ -1,10 +1,14 @@
 import numpy as np
 import soundfile as sf
 import logging
-from typing import Dict, Any, Optional, NamedTuple
+import math
+from typing import BinaryIO, Dict, Any, Mapping, Optional, NamedTuple, Union
+from types import MappingProxyType
 from pathlib import Path
 import noisereduce as nr
+from app.core.config import get_settings
 from app.core.errors import DenoiserError, ErrorCodes
+from app.core.optimization import hugepage_array
 from app.core.metrics import (
     SPECTRAL_DENOISING_TIME,
     SPECTRAL_NOISE_REDUCTION
@@ -15,9 +19,10 @@ from app.db.session import AsyncSessionLocal
 import torch
 import gc
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 class NoiseType(str, Enum):
     WHITE_NOISE = "white_noise"
@@ -125,6 +130,24 @@ class NoisePresets:
         stationary=True
     )
 
+# Resolved once at import; process_audio only copies when custom params are given
+_PRESETS: Dict[NoiseType, DenoisePreset] = {
+    noise_type: getattr(NoisePresets, noise_type.name) for noise_type in NoiseType
+}
+_PRESET_PARAMS: Dict[NoiseType, Mapping[str, Any]] = {
+    noise_type: MappingProxyType({
+        "prop_decrease": preset.prop_decrease,
+        "time_constant_s": preset.time_constant_s,
+        "freq_mask_smooth_hz": preset.freq_mask_smooth_hz,
+        "time_mask_smooth_ms": preset.time_mask_smooth_ms,
+        "stationary": preset.stationary
+    })
+    for noise_type, preset in _PRESETS.items()
+}
+_PRESET_SUMMARIES: Dict[NoiseType, Mapping[str, Any]] = {
+    noise_type: MappingProxyType(asdict(preset)) for noise_type, preset in _PRESETS.items()
+}
+
 class SpectralDenoiserService:
     """Service for audio denoising using noisereduce spectral gating"""
     _instance = None
@@ -147,20 +170,12 @@ class SpectralDenoiserService:
             logger.error(f"Spectral denoiser service initialization failed: {str(e)}")
             self.storage_service = None
 
-    def _calculate_noise_reduction(
-        self, 
-        original: np.ndarray, 
-        denoised: np.ndarray
-    ) -> float:
-        """Calculate noise reduction in dB"""
+    def _calculate_noise_reduction(self, noise_ss: float, signal_ss: float) -> float:
+        """Calculate noise reduction in dB from accumulated sums of squares"""
         try:
-            # Calculate RMS of noise reduction
-            noise = original - denoised
-            noise_rms = np.sqrt(np.mean(noise ** 2))
-            signal_rms = np.sqrt(np.mean(denoised ** 2))
-            
-            if noise_rms > 0:
-                return float(20 * np.log10(signal_rms / noise_rms))
+            # 10*log10 of energies equals 20*log10 of RMS values without the sqrt
+            if noise_ss > 0 and signal_ss > 0:
+                return 10 * math.log10(signal_ss / noise_ss)
             return 0.0
         except Exception as e:
             logger.error(f"Error calculating noise reduction: {e}")
@@ -168,8 +183,8 @@ class SpectralDenoiserService:
 
     def process_audio(
         self,
-        input_path: str,
-        output_path: str,
+        input_path: Union[str, BinaryIO],
+        output_path: Union[str, BinaryIO],
         noise_type: NoiseType = NoiseType.GENERAL,
         custom_params: Optional[Dict] = None,
         use_torch: bool = True
@@ -177,62 +192,92 @@ class SpectralDenoiserService:
         """Process audio file with spectral gating denoising optimized for specific noise types"""
         try:
             # Get preset for noise type
-            preset = getattr(NoisePresets, noise_type.upper())
+            noise_type = NoiseType(noise_type)
+            preset = _PRESETS[noise_type]
             
             # Override with custom params if provided
-            params = {
-                "prop_decrease": preset.prop_decrease,
-                "time_constant_s": preset.time_constant_s,
-                "freq_mask_smooth_hz": preset.freq_mask_smooth_hz,
-                "time_mask_smooth_ms": preset.time_mask_smooth_ms,
-                "stationary": preset.stationary
-            }
+            params = _PRESET_PARAMS[noise_type]
             if custom_params:
-                params.update(custom_params)
+                params = {**params, **custom_params}
 
             # Clear memory
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
             gc.collect()
 
-            # Read and prepare audio
-            audio_data, sample_rate = sf.read(input_path)
-            if len(audio_data.shape) > 1:
-                audio_data = audio_data.mean(axis=1)
-            audio_data = audio_data.astype(np.float32)
+            # Stream the file in overlapping blocks so only one block is in memory
+            output_format = None
+            if isinstance(output_path, (str, Path)):
+                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            else:
+                # File objects carry no extension to infer the container from
+                output_format = "WAV"
 
-            # First pass denoising
-            denoised_audio = nr.reduce_noise(
-                y=audio_data,
-                sr=sample_rate,
-                use_torch=use_torch,
-                device=str(self.device),
-                **params
-            )
+            noise_ss = 0.0
+            signal_ss = 0.0
+            frames_written = 0
+            tail = None
 
-            # Second pass if specified in preset
-            if preset.two_pass and preset.second_pass_params:
-                denoised_audio = nr.reduce_noise(
-                    y=denoised_audio,
-                    sr=sample_rate,
-                    use_torch=use_torch,
-                    device=str(self.device),
-                    **preset.second_pass_params
-                )
+            with sf.SoundFile(input_path) as source:
+                sample_rate = source.samplerate
+                total_frames = source.frames
+                block_frames = sample_rate * settings.SPECTRAL_BLOCK_SECONDS
+                overlap_frames = min(sample_rate * settings.SPECTRAL_BLOCK_OVERLAP_SECONDS, block_frames // 2)
+                fade_in = np.linspace(0.0, 1.0, overlap_frames, dtype=np.float32)
+                # Reused for the per-block residual so stats allocate nothing per block
+                residual = hugepage_array(block_frames, np.float32)
+
+                with sf.SoundFile(
+                    output_path,
+                    mode="w",
+                    samplerate=sample_rate,
+                    channels=1,
+                    format=output_format
+                ) as sink:
+                    for block in source.blocks(
+                        blocksize=block_frames,
+                        overlap=overlap_frames,
+                        dtype="float32",
+                        always_2d=True
+                    ):
+                        audio_block = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+                        denoised = self._denoise_block(audio_block, sample_rate, preset, params, use_torch)
+
+                        # Crossfade the region shared with the previous block
+                        start = 0
+                        if tail is not None:
+                            start = min(len(tail), len(denoised))
+                            ramp = fade_in if start == overlap_frames else np.linspace(
+                                0.0, 1.0, start, dtype=np.float32
+                            )
+                            denoised[:start] = tail[:start] + (denoised[:start] - tail[:start]) * ramp
 
-            # Save output
-            output_dir = Path(output_path).parent
-            output_dir.mkdir(parents=True, exist_ok=True)
-            sf.write(output_path, denoised_audio, sample_rate)
+                        # Stats over the samples this block contributes for the first time
+                        noise = np.subtract(
+                            audio_block[start:], denoised[start:], out=residual[:len(denoised) - start]
+                        )
+                        noise_ss += float(np.vdot(noise, noise))
+                        signal_ss += float(np.vdot(denoised[start:], denoised[start:]))
+
+                        # Hold back the overlap until the next block has been blended in
+                        keep = min(overlap_frames, len(denoised))
+                        if len(denoised) > keep:
+                            sink.write(denoised[:len(denoised) - keep])
+                            frames_written += len(denoised) - keep
+                        tail = denoised[len(denoised) - keep:]
+
+                    if tail is not None and len(tail):
+                        sink.write(tail)
+                        frames_written += len(tail)
 
             # Calculate stats
             stats = {
-                "original_duration": len(audio_data) / sample_rate,
-                "denoised_duration": len(denoised_audio) / sample_rate,
+                "original_duration": total_frames / sample_rate,
+                "denoised_duration": frames_written / sample_rate,
                 "sample_rate": sample_rate,
-                "noise_reduction_db": self._calculate_noise_reduction(audio_data, denoised_audio),
+                "noise_reduction_db": self._calculate_noise_reduction(noise_ss, signal_ss),
                 "noise_type": noise_type,
-                "preset_used": preset.__dict__,
+                "preset_used": dict(_PRESET_SUMMARIES[noise_type]),
                 "custom_params": custom_params,
                 "two_pass": preset.two_pass
             }
@@ -249,6 +294,36 @@ class SpectralDenoiserService:
                 error_code=ErrorCodes.DENOISING_FAILED
             )
 
+    def _denoise_block(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        preset: DenoisePreset,
+        params: Dict[str, Any],
+        use_torch: bool
+    ) -> np.ndarray:
+        """Run the preset's denoising passes over one block"""
+        with torch.inference_mode():
+            denoised = nr.reduce_noise(
+                y=audio,
+                sr=sample_rate,
+                use_torch=use_torch,
+                device=str(self.device),
+                **params
+            )
+
+            # Second pass if specified in preset
+            if preset.two_pass and preset.second_pass_params:
+                denoised = nr.reduce_noise(
+                    y=denoised,
+                    sr=sample_rate,
+                    use_torch=use_torch,
+                    device=str(self.device),
+                    **preset.second_pass_params
+                )
+
+        return np.asarray(denoised, dtype=np.float32)
+
     async def get_job_status(self, job_id: int) -> Dict[str, Any]:
         """Get status of a denoising job"""
         if not self.initialized:
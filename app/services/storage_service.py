@@ -1,13 +1,19 @@
 import boto3
+import aiohttp
+import aiofiles
+import asyncio
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
-from typing import BinaryIO, Union
+from typing import AsyncIterator, BinaryIO, List, Optional, Union
 from app.core.config import get_settings
 from urllib.parse import urlparse
-import requests
 import mimetypes
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 import os
+import tempfile
 import time
 from pathlib import Path
 from app.services.media_extractor import MediaExtractor
@@ -17,8 +23,68 @@ import io
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+HTTP_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+HTTP_MAX_RETRIES = 3
+HTTP_RETRY_BACKOFF = 0.3  # seconds, doubled per attempt
+HTTP_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+HTTP_RANGE_PART_SIZE = 8 * 1024 * 1024
+HTTP_RANGE_CONCURRENCY = 8
+S3_DELETE_BATCH_SIZE = 1000  # DeleteObjects limit
+
+# Shared by every transfer instead of rebuilding one per call
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=settings.MULTIPART_THRESHOLD,
+    multipart_chunksize=settings.MULTIPART_CHUNKSIZE,
+    max_concurrency=settings.MAX_CONCURRENCY,
+    use_threads=True
+)
+
+# boto3 transfers get their own threads, sized to the S3 connection pool, so a
+# burst of uploads can't starve the loop's default executor
+_S3_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.S3_MAX_POOL_CONNECTIONS,
+    thread_name_prefix="s3-io"
+)
+
+@functools.lru_cache(maxsize=256)
+def _content_type_for_suffix(suffix: str) -> str:
+    return mimetypes.guess_type(f"x{suffix}")[0] or "application/octet-stream"
+
+def _content_type_for(key: str) -> str:
+    """Content type for an object key, cached by extension"""
+    return _content_type_for_suffix(os.path.splitext(key)[1].lower())
+
+async def _coalesced_chunks(content: aiohttp.StreamReader, size: int) -> AsyncIterator[bytes]:
+    """Regroup a response body into blocks of at least size bytes.
+
+    iter_chunked() hands back whatever the socket buffered, often ~64 KiB, so
+    each disk write would otherwise cost one executor hop per small chunk.
+    """
+    buffer = bytearray()
+    async for chunk in content.iter_chunked(size):
+        buffer += chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+class _RangeNotSupported(Exception):
+    """Server ignored a Range request"""
+
 class StorageService:
-    def __init__(self):
+    _instance = None
+
+    def __new__(cls):
+        # One boto3 client, connection pool and HTTP session per process
+        if cls._instance is None:
+            instance = super(StorageService, cls).__new__(cls)
+            instance._initialize()
+            cls._instance = instance
+        return cls._instance
+
+    def _initialize(self):
+        """Initialize service"""
         self.s3_client = boto3.client(
             's3',
             aws_access_key_id=settings.S3_ACCESS_KEY,
@@ -29,23 +95,76 @@ class StorageService:
                     max_attempts=3,
                     mode='adaptive'
                 ),
-                max_pool_connections=50
+                max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                tcp_keepalive=True
             )
         )
         self.bucket = settings.S3_BUCKET
+        self._transfer_config = TRANSFER_CONFIG
         self.temp_dir = Path(settings.DOWNLOAD_DIR)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _run_s3(self, func, *args, **kwargs):
+        """Run a blocking boto3 call on the S3 executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_S3_EXECUTOR, functools.partial(func, *args, **kwargs))
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Get the pooled HTTP session for the running event loop"""
+        loop = asyncio.get_running_loop()
+        # aiohttp sessions are bound to the loop they were created on
+        if self._http is None or self._http.closed or self._http_loop is not loop:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=50,
+                    limit_per_host=16,
+                    keepalive_timeout=30
+                ),
+                timeout=aiohttp.ClientTimeout(sock_connect=5, sock_read=60),
+                raise_for_status=True
+            )
+            self._http_loop = loop
+        return self._http
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+        self._http_loop = None
 
-    async def upload_file(self, file_path: str, key: str) -> str:
-        """Upload file from local path to S3"""
+    async def upload_file(self, file_path: Union[str, Path, bytes, BinaryIO], key: str) -> str:
+        """Upload a local path, in-memory bytes or a file object to S3"""
         try:
-            if not isinstance(file_path, (str, Path)):
+            if isinstance(file_path, (bytes, bytearray, memoryview)):
+                await self._run_s3(
+                    self.s3_client.upload_fileobj, io.BytesIO(file_path), self.bucket, key,
+                    ExtraArgs={"ContentType": _content_type_for(key)},
+                    Config=self._transfer_config
+                )
+            elif hasattr(file_path, "read"):
+                await self._run_s3(
+                    self.s3_client.upload_fileobj, file_path, self.bucket, key,
+                    ExtraArgs={"ContentType": _content_type_for(key)},
+                    Config=self._transfer_config
+                )
+            elif isinstance(file_path, (str, Path)):
+                file_size = os.stat(file_path).st_size
+                if file_size > settings.MULTIPART_THRESHOLD:
+                    await self._multipart_upload(str(file_path), file_size, key)
+                else:
+                    await self._run_s3(
+                        self.s3_client.upload_file, str(file_path), self.bucket, key,
+                        ExtraArgs={"ContentType": _content_type_for(key)},
+                        Config=self._transfer_config
+                    )
+            else:
                 raise AudioProcessingError(
-                    message=f"Invalid file_path type: {type(file_path)}. Expected str or Path.",
+                    message=f"Invalid file_path type: {type(file_path)}. Expected path, bytes or file object.",
                     error_code=ErrorCodes.INVALID_INPUT
                 )
-            
-            self.s3_client.upload_file(str(file_path), self.bucket, key)
             url = f"https://{self.bucket}.s3.amazonaws.com/{key}"
             logger.info(f"Successfully uploaded file to {url}")
             return url
@@ -59,6 +178,164 @@ class StorageService:
                 original_error=e
             )
 
+    async def upload_fileobj(self, fileobj: BinaryIO, key: str) -> str:
+        """Upload a readable file object in place; boto3 streams it in multipart chunks"""
+        return await self.upload_file(fileobj, key)
+
+    async def _multipart_upload(self, file_path: str, file_size: int, key: str) -> None:
+        """Upload a file as concurrent multipart parts, at most MAX_CONCURRENCY in flight"""
+        upload_id = (await self._run_s3(
+            self.s3_client.create_multipart_upload,
+            Bucket=self.bucket,
+            Key=key,
+            ContentType=_content_type_for(key)
+        ))["UploadId"]
+        semaphore = asyncio.Semaphore(settings.MAX_CONCURRENCY)
+        part_size = settings.MULTIPART_CHUNKSIZE
+        failed = False
+
+        def upload_part(part_number: int, offset: int) -> dict:
+            # Each part owns its descriptor, so no read can outlive a shared fd
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                # A bytes body goes out in one sendall instead of 8 KiB file reads
+                body = os.pread(fd, part_size, offset)
+            finally:
+                os.close(fd)
+            response = self.s3_client.upload_part(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body
+            )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+        async def bounded_part(part_number: int, offset: int) -> Optional[dict]:
+            nonlocal failed
+            async with semaphore:
+                if failed:
+                    return None
+                try:
+                    return await self._run_s3(upload_part, part_number, offset)
+                except BaseException:
+                    failed = True
+                    raise
+
+        try:
+            # Let in-flight parts finish before aborting, or they outlive the abort as orphans
+            results = await asyncio.gather(
+                *(
+                    bounded_part(index + 1, offset)
+                    for index, offset in enumerate(range(0, file_size, part_size))
+                ),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            await self._run_s3(
+                self.s3_client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": results}
+            )
+        except BaseException:
+            try:
+                await self._run_s3(
+                    self.s3_client.abort_multipart_upload,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id
+                )
+            except Exception as abort_error:
+                # Keep the original error; the orphaned parts are only logged
+                logger.warning(f"Failed to abort multipart upload {upload_id} for {key}: {abort_error}")
+            raise
+
+    async def upload_stream(self, chunks: AsyncIterator[bytes], key: str) -> str:
+        """Upload an async byte stream, switching to multipart once it outgrows one part"""
+        # S3 rejects non-final parts under 5 MiB
+        part_size = max(settings.MULTIPART_CHUNKSIZE, 5 * 1024 * 1024)
+        semaphore = asyncio.Semaphore(settings.MAX_CONCURRENCY)
+        buffer = bytearray()
+        upload_id = None
+        tasks = []
+
+        async def send_part(part_number: int, body: bytes) -> dict:
+            async with semaphore:
+                response = await self._run_s3(
+                    self.s3_client.upload_part,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body
+                )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= part_size:
+                    if upload_id is None:
+                        upload_id = (await self._run_s3(
+                            self.s3_client.create_multipart_upload,
+                            Bucket=self.bucket,
+                            Key=key,
+                            ContentType=_content_type_for(key)
+                        ))["UploadId"]
+                    tasks.append(asyncio.create_task(send_part(len(tasks) + 1, bytes(buffer))))
+                    buffer = bytearray()
+
+            if upload_id is None:
+                # Small payloads never leave the buffer; a single PUT is enough
+                await self._run_s3(
+                    self.s3_client.put_object,
+                    Bucket=self.bucket,
+                    Key=key,
+                    Body=bytes(buffer),
+                    ContentType=_content_type_for(key)
+                )
+            else:
+                if buffer:
+                    tasks.append(asyncio.create_task(send_part(len(tasks) + 1, bytes(buffer))))
+                parts = await asyncio.gather(*tasks)
+                await self._run_s3(
+                    self.s3_client.complete_multipart_upload,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts}
+                )
+
+            url = f"https://{self.bucket}.s3.amazonaws.com/{key}"
+            logger.info(f"Successfully uploaded stream to {url}")
+            return url
+
+        except Exception as e:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if upload_id is not None:
+                try:
+                    await self._run_s3(
+                        self.s3_client.abort_multipart_upload,
+                        Bucket=self.bucket,
+                        Key=key,
+                        UploadId=upload_id
+                    )
+                except Exception as abort_error:
+                    logger.warning(f"Failed to abort multipart upload {upload_id} for {key}: {abort_error}")
+            logger.error(f"Failed to upload stream to S3: {str(e)}")
+            raise AudioProcessingError(
+                message="Failed to upload file",
+                error_code=ErrorCodes.UPLOAD_FAILED,
+                details={"error": str(e)},
+                original_error=e
+            )
+
     async def download_file(self, key: str, destination: str) -> None:
         """Download file from S3 to local destination"""
         try:
@@ -68,7 +345,7 @@ class StorageService:
                     error_code=ErrorCodes.INVALID_INPUT
                 )
             
-            self.s3_client.download_file(self.bucket, key, destination)
+            await self._download_s3_object(key, destination)
             logger.info(f"Successfully downloaded file {key} to {destination}")
             
         except Exception as e:
@@ -80,35 +357,129 @@ class StorageService:
                 original_error=e
             )
 
+    async def open_readable(self, key: str) -> BinaryIO:
+        """Download an object into a spooled buffer: memory for short files, disk for long ones"""
+        spool = tempfile.SpooledTemporaryFile(max_size=settings.SPOOL_MAX_SIZE, dir=self.temp_dir)
+        try:
+            await self._run_s3(
+                self.s3_client.download_fileobj, self.bucket, key, spool,
+                Config=self._transfer_config
+            )
+            spool.seek(0)
+            return spool
+        except Exception as e:
+            spool.close()
+            logger.error(f"Failed to download file {key}: {e}")
+            raise AudioProcessingError(
+                message="Failed to download file",
+                error_code=ErrorCodes.DOWNLOAD_FAILED,
+                details={"error": str(e), "key": key},
+                original_error=e
+            )
+
+    async def download_stream(self, key: str, chunk_size: int = HTTP_DOWNLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Stream an object's bytes from S3 as they arrive"""
+        body = None
+        try:
+            response = await self._run_s3(self.s3_client.get_object, Bucket=self.bucket, Key=key)
+            body = response["Body"]
+            while True:
+                chunk = await self._run_s3(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        except Exception as e:
+            logger.error(f"Failed to stream file {key}: {e}")
+            raise AudioProcessingError(
+                message="Failed to download file",
+                error_code=ErrorCodes.DOWNLOAD_FAILED,
+                details={"error": str(e), "key": key},
+                original_error=e
+            )
+        finally:
+            if body is not None:
+                body.close()
+
+    async def _download_s3_object(self, key: str, destination: str) -> None:
+        """Download an S3 object, fetching byte ranges in parallel for large objects"""
+        head = await self._run_s3(self.s3_client.head_object, Bucket=self.bucket, Key=key)
+        length = head["ContentLength"]
+        if length <= settings.MULTIPART_THRESHOLD:
+            await self._run_s3(
+                self.s3_client.download_file, self.bucket, key, destination,
+                Config=self._transfer_config
+            )
+            return
+
+        semaphore = asyncio.Semaphore(settings.MAX_CONCURRENCY)
+        part_size = settings.MULTIPART_CHUNKSIZE
+        failed = False
+        fd = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+
+        def fetch_range(start: int, end: int) -> None:
+            # IfMatch keeps every range on the object version we sized the file for
+            body = self.s3_client.get_object(
+                Bucket=self.bucket,
+                Key=key,
+                Range=f"bytes={start}-{end}",
+                IfMatch=head["ETag"]
+            )["Body"]
+            offset = start
+            for chunk in body.iter_chunks(HTTP_DOWNLOAD_CHUNK_SIZE):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+
+        async def bounded_range(start: int) -> None:
+            nonlocal failed
+            async with semaphore:
+                if failed:
+                    return
+                try:
+                    await self._run_s3(fetch_range, start, min(start + part_size, length) - 1)
+                except BaseException:
+                    failed = True
+                    raise
+
+        try:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd, 0, length)
+            else:
+                os.ftruncate(fd, length)
+            # Let in-flight ranges finish before fd is closed; executor threads can't be cancelled
+            results = await asyncio.gather(
+                *(bounded_range(start) for start in range(0, length, part_size)),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        finally:
+            os.close(fd)
+
     async def download_from_url(self, url: str) -> str:
         """Download file from URL (S3 or HTTP) to local temp directory"""
+        local_path = None
         try:
-            # Parse URL
+            # Parse URL; a unique temp name keeps concurrent downloads of the same basename apart
             parsed_url = urlparse(url)
-            filename = os.path.basename(parsed_url.path)
-            local_path = self.temp_dir / filename
+            fd, temp_path = tempfile.mkstemp(dir=self.temp_dir, suffix=Path(parsed_url.path).suffix)
+            os.close(fd)
+            local_path = Path(temp_path)
 
             if parsed_url.netloc.endswith('s3.amazonaws.com'):
                 # Download from S3
                 key = parsed_url.path.lstrip('/')
-                self.s3_client.download_file(
-                    self.bucket,
-                    key,
-                    str(local_path)
-                )
+                await self._download_s3_object(key, str(local_path))
             else:
-                # Download from HTTP URL
-                response = requests.get(url, stream=True)
-                response.raise_for_status()
-                
-                with open(local_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+                # Download from HTTP URL without blocking the event loop
+                await self._http_download(url, local_path)
 
             logger.info(f"Successfully downloaded file to {local_path}")
             return str(local_path)
 
         except Exception as e:
+            if local_path is not None:
+                local_path.unlink(missing_ok=True)
             error_msg = f"Failed to download file from {url}: {str(e)}"
             logger.error(error_msg)
             raise AudioProcessingError(
@@ -118,17 +489,119 @@ class StorageService:
                 original_error=e
             )
 
+    async def _http_download(self, url: str, local_path: Path) -> None:
+        """Download an HTTP resource, fetching byte ranges in parallel when the server allows it"""
+        length = await self._http_range_length(url)
+        if length is not None and length >= settings.MULTIPART_THRESHOLD:
+            try:
+                await self._parallel_http_download(url, local_path, length)
+                return
+            except _RangeNotSupported:
+                logger.info(f"Range requests not honoured for {url}, using a single stream")
+        await self._with_http_retries(url, lambda: self._stream_http_download(url, local_path))
+
+    async def _with_http_retries(self, url: str, operation):
+        """Run an HTTP operation, retrying transient failures with exponential backoff"""
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            try:
+                return await operation()
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                if attempt == HTTP_MAX_RETRIES:
+                    raise
+                logger.warning(f"Retrying download of {url} after error: {e}")
+            except aiohttp.ClientResponseError as e:
+                if attempt == HTTP_MAX_RETRIES or e.status not in HTTP_RETRY_STATUSES:
+                    raise
+                logger.warning(f"Retrying download of {url} after HTTP {e.status}")
+            await asyncio.sleep(HTTP_RETRY_BACKOFF * (2 ** attempt))
+
+    async def _stream_http_download(self, url: str, local_path: Path) -> None:
+        """Stream an HTTP resource to disk over the pooled session"""
+        async with self._get_http_session().get(url) as response:
+            async with aiofiles.open(local_path, 'wb') as f:
+                async for chunk in _coalesced_chunks(response.content, HTTP_DOWNLOAD_CHUNK_SIZE):
+                    await f.write(chunk)
+
+    async def _http_range_length(self, url: str) -> Optional[int]:
+        """Content length if the server advertises byte ranges on an uncompressed body"""
+        try:
+            async with self._get_http_session().head(
+                url,
+                allow_redirects=True,
+                headers={"Accept-Encoding": "identity"}
+            ) as response:
+                if response.headers.get("Accept-Ranges", "").lower() != "bytes":
+                    return None
+                if response.headers.get("Content-Encoding", "identity") != "identity":
+                    return None
+                return response.content_length
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+
+    async def _parallel_http_download(self, url: str, local_path: Path, length: int) -> None:
+        """Fetch fixed-size byte ranges concurrently and write each at its offset"""
+        semaphore = asyncio.Semaphore(HTTP_RANGE_CONCURRENCY)
+        fd = os.open(local_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd, 0, length)
+            else:
+                os.ftruncate(fd, length)
+
+            async def fetch_range(start: int, end: int) -> None:
+                async with semaphore:
+                    await self._with_http_retries(url, lambda: self._fetch_range(url, fd, start, end))
+
+            tasks = [
+                asyncio.create_task(fetch_range(start, min(start + HTTP_RANGE_PART_SIZE, length) - 1))
+                for start in range(0, length, HTTP_RANGE_PART_SIZE)
+            ]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        finally:
+            os.close(fd)
+
+    async def _fetch_range(self, url: str, fd: int, start: int, end: int) -> None:
+        """Write bytes start..end (inclusive) of an HTTP resource into fd"""
+        async with self._get_http_session().get(
+            url,
+            headers={"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+        ) as response:
+            if response.status != 206:
+                raise _RangeNotSupported(url)
+            offset = start
+            async for chunk in _coalesced_chunks(response.content, HTTP_DOWNLOAD_CHUNK_SIZE):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+
     async def delete_file(self, key: str):
         """Delete a file from S3"""
-        try:
-            self.s3_client.delete_object(
-                Bucket=self.bucket,
-                Key=key
-            )
-            logger.info(f"Successfully deleted file {key} from bucket {self.bucket}")
-        except Exception as e:
-            logger.error(f"Failed to delete file {key}: {e}")
-            # Don't raise - just log the error
+        await self.delete_files([key])
+
+    async def delete_files(self, keys: List[str]):
+        """Delete files from S3, up to 1000 keys per request"""
+        for start in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+            batch = keys[start:start + S3_DELETE_BATCH_SIZE]
+            try:
+                response = await self._run_s3(
+                    self.s3_client.delete_objects,
+                    Bucket=self.bucket,
+                    Delete={
+                        "Objects": [{"Key": key} for key in batch],
+                        "Quiet": True
+                    }
+                )
+                for error in response.get("Errors", []):
+                    logger.error(f"Failed to delete file {error.get('Key')}: {error.get('Message')}")
+                logger.info(f"Deleted {len(batch)} files from bucket {self.bucket}")
+            except Exception as e:
+                logger.error(f"Failed to delete files {batch}: {e}")
+                # Don't raise - just log the error
 
     def generate_presigned_url(self, key: str, expiration: int = 3600) -> str:
         """Generate a presigned URL for an S3 object"""
@@ -175,7 +648,7 @@ class StorageService:
     def download_file_sync(self, key: str, local_path: str) -> None:
         """Synchronous version of download_file"""
         try:
-            self.s3_client.download_file(self.bucket, key, local_path)
+            self.s3_client.download_file(self.bucket, key, local_path, Config=self._transfer_config)
         except Exception as e:
             logger.error(f"Failed to download file from S3: {str(e)}")
             raise
@@ -184,9 +657,17 @@ class StorageService:
         """Synchronous version of upload_file"""
         try:
             if isinstance(file_data, (str, Path)):
-                self.s3_client.upload_file(str(file_data), self.bucket, key)
+                self.s3_client.upload_file(
+                    str(file_data), self.bucket, key,
+                    ExtraArgs={"ContentType": _content_type_for(key)},
+                    Config=self._transfer_config
+                )
             else:
-                self.s3_client.upload_fileobj(file_data, self.bucket, key)
+                self.s3_client.upload_fileobj(
+                    file_data, self.bucket, key,
+                    ExtraArgs={"ContentType": _content_type_for(key)},
+                    Config=self._transfer_config
+                )
             return f"{self.bucket}/{key}"
         except Exception as e:
             logger.error(f"Failed to upload file to S3: {str(e)}")
@@ -2,11 +2,15 @@ from faster_whisper import WhisperModel
 from pathlib import Path
 import boto3
 from app.core.config import get_settings
+import asyncio
 import logging
-from typing import Tuple, Optional
+import threading
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Iterable, Tuple, Optional
 from app.core.device import get_device_manager
 from app.core.metrics import MODEL_INFERENCE_TIME
 from app.core.errors import AudioProcessingError, ErrorCodes
+import os
 import time
 import uuid
 import torch
@@ -16,22 +20,48 @@ from app.services.storage_service import StorageService
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+_END_OF_SEGMENTS = object()
+# Decoded segments buffered ahead of the upload before the decoder thread waits
+_SEGMENT_BUFFER = 64
+
 class TranslationService:
     def __init__(self):
         self.device_manager = get_device_manager()
         self.model = self._initialize_model()
         self.storage_service = StorageService()  # Use StorageService
+        self._infer_sem: Optional[asyncio.Semaphore] = None
+        self._infer_sem_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._infer_timer = MODEL_INFERENCE_TIME.labels(model_name="whisper", operation="translation")
         
+    def _get_infer_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore capping concurrent transcriptions on the running event loop"""
+        loop = asyncio.get_running_loop()
+        # asyncio primitives bind to the loop they first wait on
+        if self._infer_sem is None or self._infer_sem_loop is not loop:
+            self._infer_sem = asyncio.Semaphore(settings.WHISPER_MAX_CONCURRENCY)
+            self._infer_sem_loop = loop
+        return self._infer_sem
+
     def _initialize_model(self) -> WhisperModel:
         try:
             # Correctly format the repo_id
             repo_id = "Systran/faster-whisper-large-v3"  # Use the correct namespace and repo name
 
-            # Download the model using the correct repo_id
-            model_dir = snapshot_download(repo_id=repo_id)
+            # Use the cached snapshot when present to skip the hub round trip
+            try:
+                model_dir = snapshot_download(repo_id=repo_id, local_files_only=True)
+            except Exception:
+                model_dir = snapshot_download(repo_id=repo_id)
 
-            # Initialize the Whisper model
-            model = WhisperModel(model_dir)
+            # fp16 on GPU, int8 on CPU
+            use_cuda = self.device_manager.device.type == "cuda"
+            model = WhisperModel(
+                model_dir,
+                device="cuda" if use_cuda else "cpu",
+                compute_type="float16" if use_cuda else "int8",
+                num_workers=settings.WHISPER_WORKERS,
+                cpu_threads=os.cpu_count() or 0
+            )
             logger.info("Whisper model initialized successfully")
             return model
 
@@ -44,6 +74,45 @@ class TranslationService:
                 original_error=e
             )
 
+    async def _stream_segments(self, segments: Iterable[Any]) -> AsyncIterator[bytes]:
+        """Decode Whisper segments on a worker thread and yield newline-joined transcript bytes"""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        # Free slots in the queue; the decoder waits on these instead of running ahead
+        slots = threading.Semaphore(_SEGMENT_BUFFER)
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for segment in segments:
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    loop.call_soon_threadsafe(queue.put_nowait, segment.text)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, _END_OF_SEGMENTS)
+
+        producer = loop.run_in_executor(None, produce)
+        try:
+            separator = b""
+            while True:
+                item = await queue.get()
+                if item is _END_OF_SEGMENTS:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                slots.release()
+                yield separator + item.encode("utf-8")
+                separator = b"\n"
+        finally:
+            # The decoder thread is using the GPU; it must exit before the caller frees its slot
+            stop.set()
+            await producer
+
     async def translate_audio(
         self,
         audio_path: str,
@@ -60,26 +129,28 @@ class TranslationService:
             # Download audio file using StorageService
             local_audio_path = await self.storage_service.download_from_url(audio_path)
             
-            # Transcribe and translate with timing
-            start_time = time.time()
-            segments, info = self.model.transcribe(
-                str(local_audio_path),
-                task="translate" if target_language != "en" else "transcribe",
-                language=source_language,
-                beam_size=5,  # Default beam size
-                best_of=5    # Default best_of
-            )
-            inference_time = time.time() - start_time
-            
-            # Record metrics
-            MODEL_INFERENCE_TIME.labels(model_name="whisper").observe(inference_time)
-            
-            # Combine segments and save transcript
-            transcript = "\n".join([segment.text for segment in segments])
             transcript_path = f"transcripts/{Path(audio_path).stem}_{target_language}_{uuid.uuid4()}.txt"
             
-            # Save transcript to S3 using StorageService
-            await self.storage_service.upload_file(open(transcript_path, 'rb'), transcript_path)
+            # Transcribe and translate with timing, off the event loop
+            async with self._get_infer_semaphore():
+                start_time = time.perf_counter()
+                segments, info = await asyncio.to_thread(
+                    self.model.transcribe,
+                    str(local_audio_path),
+                    task="translate" if target_language != "en" else "transcribe",
+                    language=source_language,
+                    beam_size=5,  # Default beam size
+                    best_of=5    # Default best_of
+                )
+                
+                # Segments decode lazily; upload them to S3 as they are produced.
+                # aclosing stops the decoder thread before the semaphore is released
+                async with aclosing(self._stream_segments(segments)) as transcript:
+                    await self.storage_service.upload_stream(transcript, transcript_path)
+                inference_time = time.perf_counter() - start_time
+            
+            # Record metrics
+            self._infer_timer.observe(inference_time)
             
             # Log memory stats after inference
             mem_stats = self.device_manager.get_memory_stats()
@@ -21,8 +21,8 @@ celery_app = Celery(
 
 # Start worker command:
 """
-# Start dedenoiser worker
-celery -A app.workers.celery_worker worker -Q denoiser-queue --concurrency=2
+# Start dedenoiser worker (threads share one copy of the model on the GPU)
+celery -A app.workers.celery_worker worker -Q denoiser-queue --pool=threads --concurrency=4
 
 # Start spectral denoiser worker
 celery -A app.workers.celery_worker worker -Q denoiser-queue --concurrency=2
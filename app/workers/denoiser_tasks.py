@@ -1,46 +1,66 @@
 from app.core.celery_app import celery_app
 from app.core.task_processor import task_processor
 from app.core.constants import CeleryTasks, CeleryQueues
-from app.services.denoiser_service import DenoiserService, DenoiserError
-from app.services.storage_service import StorageService
+from app.services.denoiser_service import DenoiserError
+from app.core.service_registry import get_denoiser_service, get_storage_service
 from app.models.audio import DenoiseJob, ProcessingStatus
 from app.core.errors import AudioProcessingError, ErrorCodes
 from datetime import datetime
 import logging
 import asyncio
-from pathlib import Path
+import time
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Dict, Any
+from typing import AsyncGenerator, Dict, Any, Optional
 from app.db.session import AsyncSessionLocal
 import tempfile
 import os
 from app.core.optimization import resource_optimizer, optimize_array_processing
+from app.core.worker_loop import run_async
+from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+OUTPUT_KEY_PREFIX = "processed/denoiser"
 
 def init_worker():
     """Initialize worker process"""
     resource_optimizer.optimize_for_denoising()
 
-def run_async(coro):
-    """Run async function in sync context"""
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(coro)
+async def claim_job(job_id: int) -> bool:
+    """Mark the job PROCESSING in its own short transaction; False if another worker holds it"""
+    async with AsyncSessionLocal() as session:
+        # Never wait on a row another worker has locked
+        unlocked = (
+            select(DenoiseJob.id)
+            .where(DenoiseJob.id == job_id)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await session.execute(
+            update(DenoiseJob)
+            .where(DenoiseJob.id == unlocked)
+            .values(status=ProcessingStatus.PROCESSING, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        if result.rowcount:
+            return True
+        if await session.get(DenoiseJob, job_id) is None:
+            raise ValueError(f"Job {job_id} not found")
+        return False
 
 @asynccontextmanager
-async def get_job_session(job_id: int) -> AsyncGenerator[tuple[AsyncSession, DenoiseJob], None]:
-    """Get long-running async session with job"""
+async def get_job_session(job_id: int) -> AsyncGenerator[tuple[AsyncSession, Optional[DenoiseJob]], None]:
+    """Get long-running async session with job, or None if another worker has it locked"""
     async with AsyncSessionLocal() as session:
         try:
-            stmt = select(DenoiseJob).where(DenoiseJob.id == job_id).with_for_update()
+            stmt = select(DenoiseJob).where(DenoiseJob.id == job_id).with_for_update(skip_locked=True)
             result = await session.execute(stmt)
             job = result.scalar_one_or_none()
             
-            if not job:
-                raise ValueError(f"Job {job_id} not found")
-            
             yield session, job
             await session.commit()
             
@@ -59,7 +79,7 @@ async def process_denoising(
 ) -> Dict[str, Any]:
     """Process audio denoising with Denoiser"""
     try:
-        denoiser_service = DenoiserService()
+        denoiser_service = get_denoiser_service()
         
         # Validate input file
         audio_info = denoiser_service.validate_audio_file(input_temp)
@@ -103,7 +123,7 @@ def denoise_audio(self, job_id: int):
         init_worker()
         
         # Check if denoiser service is initialized
-        denoiser_service = DenoiserService()
+        denoiser_service = get_denoiser_service()
         if not denoiser_service.initialized:
             raise DenoiserError(
                 message="Denoiser service not initialized",
@@ -115,61 +135,58 @@ def denoise_audio(self, job_id: int):
             output_temp = None
             
             try:
+                if not await claim_job(job_id):
+                    logger.warning(f"Job {job_id} is locked by another worker, skipping")
+                    return None
+                
                 async with get_job_session(job_id) as (session, job):
+                    if job is None:
+                        logger.warning(f"Job {job_id} is locked by another worker, skipping")
+                        return None
+                    
+                    # Create temporary files for processing
+                    input_temp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+                    output_temp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+                    
                     try:
-                        # Update status to processing
-                        job.status = ProcessingStatus.PROCESSING
-                        await session.commit()
-                        
-                        # Create temporary files for processing
-                        input_temp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-                        output_temp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+                        # Download from S3 to temp file
+                        storage_service = get_storage_service()
+                        await storage_service.download_file(
+                            job.input_path,
+                            input_temp.name
+                        )
+                        input_temp.flush()
                         
-                        try:
-                            # Download from S3 to temp file
-                            storage_service = StorageService()
-                            await storage_service.download_file(
-                                job.input_path,
-                                input_temp.name
-                            )
-                            input_temp.flush()
-                            
-                            # Process audio
-                            result = await process_denoising(
+                        # Process audio; the threads pool enforces no time limit, so bound it here
+                        result = await asyncio.wait_for(
+                            process_denoising(
                                 job=job,
                                 input_temp=input_temp.name,
                                 output_temp=output_temp.name
-                            )
-                            
-                            # Upload processed file to S3
-                            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-                            filename = Path(job.input_path).stem
-                            output_key = f"processed/denoiser/{job_id}/{timestamp}_{filename}_denoised.wav"
-                            
-                            await storage_service.upload_file(
-                                output_temp.name,
-                                output_key
-                            )
-                            
-                            # Update job with results
-                            job.output_path = output_key
-                            job.stats = result["stats"]
-                            job.status = ProcessingStatus.COMPLETED
-                            job.completed_at = datetime.utcnow()
-                            await session.commit()
-                            
-                            return result
-                            
-                        except Exception as e:
-                            logger.error(f"Processing failed: {str(e)}")
-                            job.status = ProcessingStatus.FAILED
-                            job.error_message = str(e)
-                            await session.commit()
-                            raise
-                            
+                            ),
+                            timeout=settings.DENOISER_PROCESS_TIMEOUT
+                        )
+                        
+                        # Upload inside the task so it is only acked once the output is in S3
+                        stem = os.path.basename(job.input_path).rsplit(".", 1)[0]
+                        output_key = f"{OUTPUT_KEY_PREFIX}/{job_id}/{time.time_ns() // 1_000_000_000}_{stem}_denoised.wav"
+                        
+                        output_temp.close()
+                        await storage_service.upload_file(output_temp.name, output_key)
+                        
+                        job.output_path = output_key
+                        job.stats = result["stats"]
+                        job.status = ProcessingStatus.COMPLETED
+                        job.completed_at = datetime.utcnow()
+                        
+                        # Committed once, when the job session closes
+                        return result
+                        
                     except Exception as e:
-                        if self.request.retries < self.max_retries:
-                            raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+                        logger.error(f"Processing failed: {str(e)}")
+                        job.status = ProcessingStatus.FAILED
+                        job.error_message = str(e)
+                        await session.commit()
                         raise
                         
             finally:
@@ -183,10 +200,16 @@ def denoise_audio(self, job_id: int):
                         except Exception as e:
                             logger.warning(f"Failed to cleanup temp file: {e}")
                 
-        return run_async(process_job())
+        try:
+            return run_async(process_job())
+        except Exception as e:
+            # self.request is thread-local; retry from the task thread, not the worker loop
+            if self.request.retries < self.max_retries:
+                raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+            raise
         
     except Exception as e:
         logger.error(f"Denoising failed for job {job_id}: {str(e)}")
         raise
     finally:
-        resource_optimizer.cleanup()
\ No newline at end of file
+        resource_optimizer.maybe_cleanup()
\ No newline at end of file
@@ -1,46 +1,73 @@
 from app.core.celery_app import celery_app
 from app.core.task_processor import task_processor
 from app.core.constants import CeleryTasks, CeleryQueues
-from app.services.speaker_diarization import SpeakerDiarizationService
-from app.services.speaker_extraction import SpeakerExtractionService
+from app.core.service_registry import get_diarization_service, get_extraction_service
 from app.db.session import AsyncSessionLocal
 from app.models.audio import SpeakerJob, ProcessingStatus
 import logging
 from app.core.device import get_device_manager
 import torch
-from datetime import datetime
-import asyncio
+from datetime import datetime, timedelta, timezone
 from app.core.errors import AudioProcessingError, ErrorCodes
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import and_, or_, update
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Optional
+from app.core.worker_loop import run_async
+from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_INITIALIZED = False
 
 def init_worker():
-    """Initialize worker process"""
+    """Initialize worker process; runs once from worker_process_init"""
+    global _INITIALIZED
+    if _INITIALIZED:
+        return
     device_manager = get_device_manager()
     if device_manager.is_gpu_available:
-        torch.cuda.empty_cache()
         torch.cuda.set_per_process_memory_fraction(0.7)
-
-def run_async(coro):
-    """Run async function in sync context"""
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(coro)
+    _INITIALIZED = True
 
 @asynccontextmanager
-async def get_job_session(job_id: int) -> AsyncGenerator[tuple[AsyncSession, SpeakerJob], None]:
-    """Get long-running async session with job"""
+async def get_job_session(
+    job_id: int,
+    task_id: Optional[str] = None
+) -> AsyncGenerator[tuple[AsyncSession, Optional[SpeakerJob]], None]:
+    """Claim the job with a conditional UPDATE and yield it, or None if another worker has it"""
     async with AsyncSessionLocal() as session:
         try:
-            # Get job with FOR UPDATE lock
-            stmt = select(SpeakerJob).where(SpeakerJob.id == job_id).with_for_update()
-            result = await session.execute(stmt)
-            job = result.scalar_one_or_none()
+            # PROCESSING rows are orphaned once older than any task can run
+            now = datetime.now(timezone.utc)
+            reclaimable = [SpeakerJob.updated_at < now - timedelta(seconds=settings.TASK_HARD_TIMEOUT)]
+            if task_id is not None:
+                # acks_late redelivers the same task id after a worker crash
+                reclaimable.append(SpeakerJob.task_id == task_id)
             
-            if not job:
+            # No row lock is held while processing; later commits are checked against the version
+            stmt = (
+                update(SpeakerJob)
+                .where(
+                    SpeakerJob.id == job_id,
+                    or_(
+                        # Retries re-claim their own FAILED row
+                        SpeakerJob.status.in_((ProcessingStatus.PENDING, ProcessingStatus.FAILED)),
+                        and_(SpeakerJob.status == ProcessingStatus.PROCESSING, or_(*reclaimable))
+                    )
+                )
+                .values(
+                    status=ProcessingStatus.PROCESSING,
+                    version=SpeakerJob.version + 1,
+                    updated_at=now
+                )
+                .returning(SpeakerJob)
+            )
+            job = (await session.execute(stmt)).scalar_one_or_none()
+            await session.commit()
+            
+            if job is None and await session.get(SpeakerJob, job_id) is None:
                 raise ValueError(f"Job {job_id} not found")
             
             yield session, job
@@ -53,6 +80,69 @@ async def get_job_session(job_id: int) -> AsyncGenerator[tuple[AsyncSession, Spe
         finally:
             await session.close()
 
+async def process_job(
+    job_id: int,
+    label: str,
+    process: Callable[[SpeakerJob], Awaitable[Dict[str, Any]]],
+    task_id: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Claim the job, run the service call and record the terminal state"""
+    async with get_job_session(job_id, task_id) as (session, job):
+        if job is None:
+            logger.warning(f"Job {job_id} was claimed by another worker, skipping")
+            return None
+        
+        try:
+            result = await process(job)
+            
+            # Update job with results
+            job.result = result
+            job.status = ProcessingStatus.COMPLETED
+            job.completed_at = datetime.utcnow()
+            await session.commit()
+            
+            logger.info(f"{label} completed for job {job_id}")
+            return result
+            
+        except AudioProcessingError as e:
+            job.status = ProcessingStatus.FAILED
+            job.error_message = str(e)
+            job.error_code = e.error_code
+            await session.commit()
+            logger.error(f"{label} failed for job {job_id}: {str(e)}")
+            return {
+                "status": "failed",
+                "error": str(e),
+                "error_code": e.error_code
+            }
+            
+        except Exception as e:
+            job.status = ProcessingStatus.FAILED
+            job.error_message = f"Unexpected error: {str(e)}"
+            job.error_code = ErrorCodes.UNKNOWN_ERROR
+            await session.commit()
+            logger.error(f"{label} failed for job {job_id}: {str(e)}")
+            raise
+
+def run_speaker_task(
+    job_id: int,
+    label: str,
+    process: Callable[[SpeakerJob], Awaitable[Dict[str, Any]]],
+    task_id: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Shared body of the speaker tasks"""
+    try:
+        return run_async(process_job(job_id, label, process, task_id))
+        
+    except Exception as e:
+        logger.error(f"{label} failed for job {job_id}: {str(e)}")
+        if isinstance(e, torch.cuda.OutOfMemoryError):
+            get_device_manager().clear_cache()
+        raise
+    finally:
+        # Every N tasks, not every task: empty_cache() syncs the device
+        get_device_manager().maybe_clear_cache()
+
 @celery_app.task(
     name=CeleryTasks.EXTRACT_SPEAKERS,
     queue=CeleryQueues.SPEAKER,
@@ -66,60 +156,12 @@ async def get_job_session(job_id: int) -> AsyncGenerator[tuple[AsyncSession, Spe
 @task_processor.process_task("speaker_extraction")
 def extract_speakers(self, job_id: int):
     """Speaker extraction task"""
-    try:
-        init_worker()
-        
-        async def process_job():
-            async with get_job_session(job_id) as (session, job):
-                try:
-                    # Get input path
-                    input_path = job.input_path
-                    
-                    # Update status to processing
-                    job.status = ProcessingStatus.PROCESSING
-                    await session.commit()
-                    
-                    # Process audio
-                    service = SpeakerExtractionService()
-                    result = await service.process_audio(input_path)
-                    
-                    # Update job with results
-                    job.result = result
-                    job.status = ProcessingStatus.COMPLETED
-                    job.completed_at = datetime.utcnow()
-                    await session.commit()
-                    
-                    logger.info(f"Speaker extraction completed for job {job_id}")
-                    return result
-                    
-                except AudioProcessingError as e:
-                    job.status = ProcessingStatus.FAILED
-                    job.error_message = str(e)
-                    job.error_code = e.error_code
-                    await session.commit()
-                    logger.error(f"Speaker extraction failed for job {job_id}: {str(e)}")
-                    return {
-                        "status": "failed",
-                        "error": str(e),
-                        "error_code": e.error_code
-                    }
-                    
-                except Exception as e:
-                    job.status = ProcessingStatus.FAILED
-                    job.error_message = f"Unexpected error: {str(e)}"
-                    job.error_code = ErrorCodes.UNKNOWN_ERROR
-                    await session.commit()
-                    logger.error(f"Speaker extraction failed for job {job_id}: {str(e)}")
-                    raise
-        
-        return run_async(process_job())
-        
-    except Exception as e:
-        logger.error(f"Speaker extraction failed for job {job_id}: {str(e)}")
-        raise
-    finally:
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
+    return run_speaker_task(
+        job_id,
+        "Speaker extraction",
+        lambda job: get_extraction_service().process_audio(job.input_path),
+        self.request.id
+    )
 
 @celery_app.task(
     name=CeleryTasks.DIARIZE_SPEAKERS,
@@ -134,57 +176,11 @@ def extract_speakers(self, job_id: int):
 @task_processor.process_task("speaker_diarization")
 def diarize_speakers(self, job_id: int, num_speakers: int = None):
     """Speaker diarization task"""
-    try:
-        init_worker()
-        
-        async def process_job():
-            async with get_job_session(job_id) as (session, job):
-                try:
-                    # Get input path
-                    input_path = job.input_path
-                    
-                    # Update status to processing
-                    job.status = ProcessingStatus.PROCESSING
-                    await session.commit()
-                    
-                    # Process audio
-                    service = SpeakerDiarizationService()
-                    result = await service.process_audio(input_path, num_speakers=num_speakers)
-                    
-                    # Update job with results
-                    job.result = result
-                    job.status = ProcessingStatus.COMPLETED
-                    job.completed_at = datetime.utcnow()
-                    await session.commit()
-                    
-                    logger.info(f"Speaker diarization completed for job {job_id}")
-                    return result
-                    
-                except AudioProcessingError as e:
-                    job.status = ProcessingStatus.FAILED
-                    job.error_message = str(e)
-                    job.error_code = e.error_code
-                    await session.commit()
-                    logger.error(f"Speaker diarization failed for job {job_id}: {str(e)}")
-                    return {
-                        "status": "failed",
-                        "error": str(e),
-                        "error_code": e.error_code
-                    }
-                    
-                except Exception as e:
-                    job.status = ProcessingStatus.FAILED
-                    job.error_message = f"Unexpected error: {str(e)}"
-                    job.error_code = ErrorCodes.UNKNOWN_ERROR
-                    await session.commit()
-                    logger.error(f"Speaker diarization failed for job {job_id}: {str(e)}")
-                    raise
-        
-        return run_async(process_job())
-        
-    except Exception as e:
-        logger.error(f"Speaker diarization failed for job {job_id}: {str(e)}")
-        raise
-    finally:
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
\ No newline at end of file
+    return run_speaker_task(
+        job_id,
+        "Speaker diarization",
+        lambda job: get_diarization_service().process_audio(
+            job.id, job.input_path, num_speakers=num_speakers
+        ),
+        self.request.id
+    )
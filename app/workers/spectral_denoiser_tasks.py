@@ -1,45 +1,79 @@
 from app.core.celery_app import celery_app
 from app.core.task_processor import task_processor
 from app.core.constants import CeleryTasks, CeleryQueues
-from app.services.spectral_denoiser_service import SpectralDenoiserService
-from app.services.storage_service import StorageService
+from app.core.service_registry import get_spectral_denoiser_service, get_storage_service
 from app.models.audio import DenoiseJob, ProcessingStatus
 from app.core.errors import AudioProcessingError, ErrorCodes
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
-import asyncio
-from pathlib import Path
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import and_, or_, update
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Dict, Any
+from typing import AsyncGenerator, BinaryIO, Dict, Any, List, Optional
 import torch
 from app.db.session import AsyncSessionLocal
 import tempfile
 import os
-from app.core.optimization import resource_optimizer
+import time
+from app.core.optimization import resource_optimizer, pin_to_numa_node
+from app.core.worker_loop import run_async
+from app.core.config import get_settings
+import asyncio
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+OUTPUT_KEY_PREFIX = "processed/spectral_denoiser"
+
+_INITIALIZED = False
 
 def init_worker():
-    """Initialize worker process"""
+    """Initialize worker process; runs once from worker_process_init"""
+    global _INITIALIZED
+    if _INITIALIZED:
+        return
     resource_optimizer.optimize_for_denoising()
-
-def run_async(coro):
-    """Run async function in sync context"""
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(coro)
+    if settings.SPECTRAL_NUMA_PIN:
+        pin_to_numa_node(int(os.environ.get("CELERY_WORKER_ID", "0")))
+    _INITIALIZED = True
 
 @asynccontextmanager
-async def get_job_session(job_id: int) -> AsyncGenerator[tuple[AsyncSession, DenoiseJob], None]:
-    """Get long-running async session with job"""
+async def get_job_session(
+    job_id: int,
+    task_id: Optional[str] = None
+) -> AsyncGenerator[tuple[AsyncSession, Optional[DenoiseJob]], None]:
+    """Claim the job with a conditional UPDATE and yield it, or None if another worker has it"""
     async with AsyncSessionLocal() as session:
         try:
-            stmt = select(DenoiseJob).where(DenoiseJob.id == job_id).with_for_update()
-            result = await session.execute(stmt)
-            job = result.scalar_one_or_none()
+            # PROCESSING rows are orphaned once older than any task can run
+            now = datetime.utcnow()
+            reclaimable = [DenoiseJob.updated_at < now - timedelta(seconds=settings.TASK_HARD_TIMEOUT)]
+            if task_id is not None:
+                # acks_late redelivers the same task id after a worker crash
+                reclaimable.append(DenoiseJob.task_id == task_id)
+            
+            # No row lock is held while processing; later commits are checked against the version
+            stmt = (
+                update(DenoiseJob)
+                .where(
+                    DenoiseJob.id == job_id,
+                    or_(
+                        # Retries re-claim their own FAILED row
+                        DenoiseJob.status.in_((ProcessingStatus.PENDING, ProcessingStatus.FAILED)),
+                        and_(DenoiseJob.status == ProcessingStatus.PROCESSING, or_(*reclaimable))
+                    )
+                )
+                .values(
+                    status=ProcessingStatus.PROCESSING,
+                    version=DenoiseJob.version + 1,
+                    updated_at=now
+                )
+                .returning(DenoiseJob)
+            )
+            job = (await session.execute(stmt)).scalar_one_or_none()
+            await session.commit()
             
-            if not job:
+            if job is None and await session.get(DenoiseJob, job_id) is None:
                 raise ValueError(f"Job {job_id} not found")
             
             yield session, job
@@ -54,20 +88,21 @@ async def get_job_session(job_id: int) -> AsyncGenerator[tuple[AsyncSession, Den
 
 async def process_denoising(
     job: DenoiseJob,
-    input_temp: str,
-    output_temp: str
+    source: BinaryIO,
+    sink: BinaryIO
 ) -> Dict[str, Any]:
     """Process audio denoising with spectral gating"""
-    service = SpectralDenoiserService()
+    service = get_spectral_denoiser_service()
     
     # Extract parameters from job
     noise_type = job.parameters.get("noise_type", "general")
     custom_params = job.parameters.get("custom_params", {})
     
-    # Process audio - note: process_audio is not async
-    result = service.process_audio(
-        input_path=input_temp,
-        output_path=output_temp,
+    # process_audio is blocking; keep it off the shared worker loop
+    result = await asyncio.to_thread(
+        service.process_audio,
+        input_path=source,
+        output_path=sink,
         noise_type=noise_type,
         custom_params=custom_params,
         use_torch=True
@@ -75,6 +110,120 @@ async def process_denoising(
     
     return result
 
+def output_key_for(job_id: int, input_path: str) -> str:
+    """S3 key for a job's denoised output"""
+    stem = os.path.basename(input_path).rsplit(".", 1)[0]
+    return f"{OUTPUT_KEY_PREFIX}/{job_id}/{time.time_ns() // 1_000_000_000}_{stem}_denoised.wav"
+
+async def claim_job(job_id: int, task_id: Optional[str] = None) -> Optional[DenoiseJob]:
+    """Claim a job in its own short session; the returned row is detached"""
+    async with get_job_session(job_id, task_id) as (session, job):
+        return job
+
+async def finish_job(job: DenoiseJob, **values: Any) -> None:
+    """Write a claimed job's terminal state, checked against its version"""
+    async with AsyncSessionLocal() as session:
+        job = await session.merge(job, load=False)
+        for name, value in values.items():
+            setattr(job, name, value)
+        job.updated_at = datetime.utcnow()
+        await session.commit()
+
+async def process_batch(job_ids: List[int], task_id: Optional[str] = None) -> Dict[str, Dict[int, str]]:
+    """Denoise several jobs with downloads and uploads overlapping the compute"""
+    storage_service = get_storage_service()
+    download_slots = asyncio.Semaphore(settings.SPECTRAL_PREFETCH_CONCURRENCY)
+    completed: Dict[int, str] = {}
+    failed: Dict[int, str] = {}
+    
+    jobs = []
+    for job_id in job_ids:
+        try:
+            job = await claim_job(job_id, task_id)
+        except ValueError as e:
+            failed[job_id] = str(e)
+            continue
+        if job is None:
+            logger.warning(f"Job {job_id} was claimed by another worker, skipping")
+            continue
+        jobs.append(job)
+    # Claimed jobs without a terminal state yet
+    pending: Dict[int, DenoiseJob] = {job.id: job for job in jobs}
+    
+    async def fetch(job: DenoiseJob):
+        # The slot is held until the input is consumed, bounding buffered inputs, not just downloads
+        await download_slots.acquire()
+        try:
+            return job, await storage_service.open_readable(job.input_path), None
+        except Exception as e:
+            download_slots.release()
+            return job, None, e
+    
+    async def upload(job: DenoiseJob, sink: BinaryIO, result: Dict[str, Any]):
+        try:
+            output_key = output_key_for(job.id, job.input_path)
+            sink.seek(0)
+            await storage_service.upload_file(sink, output_key)
+            await finish_job(
+                job,
+                output_path=output_key,
+                stats=result["stats"],
+                status=ProcessingStatus.COMPLETED,
+                completed_at=datetime.utcnow()
+            )
+            pending.pop(job.id, None)
+            completed[job.id] = output_key
+        except Exception as e:
+            await fail(job, e)
+        finally:
+            sink.close()
+    
+    async def fail(job: DenoiseJob, error: Exception):
+        pending.pop(job.id, None)
+        logger.error(f"Processing failed for job {job.id}: {str(error)}")
+        failed[job.id] = str(error)
+        await finish_job(job, status=ProcessingStatus.FAILED, error_message=str(error))
+    
+    downloads = [asyncio.create_task(fetch(job)) for job in jobs]
+    uploads = []
+    try:
+        # Denoise in download-completion order while later inputs are still arriving
+        for next_download in asyncio.as_completed(downloads):
+            job, source, error = await next_download
+            if error is not None:
+                await fail(job, error)
+                continue
+            
+            sink = tempfile.SpooledTemporaryFile(max_size=settings.SPOOL_MAX_SIZE)
+            try:
+                result = await process_denoising(job=job, source=source, sink=sink)
+            except Exception as e:
+                sink.close()
+                await fail(job, e)
+                continue
+            finally:
+                source.close()
+                download_slots.release()
+            
+            # The upload overlaps the next job's denoising
+            uploads.append(asyncio.create_task(upload(job, sink, result)))
+    finally:
+        for task in downloads:
+            task.cancel()
+        # Close inputs that finished downloading but were never processed
+        for outcome in await asyncio.gather(*downloads, return_exceptions=True):
+            if isinstance(outcome, tuple) and outcome[1] is not None:
+                outcome[1].close()
+        await asyncio.gather(*uploads, return_exceptions=True)
+        # A cancelled or time-limited batch must not leave its claims PROCESSING
+        for job in list(pending.values()):
+            try:
+                await fail(job, RuntimeError("Batch stopped before the job was processed"))
+            except Exception as e:
+                logger.error(f"Failed to release job {job.id}: {str(e)}")
+    
+    return {"completed": completed, "failed": failed}
+
 @celery_app.task(
     name=CeleryTasks.SPECTRAL_DENOISE_AUDIO,
     queue=CeleryQueues.SPECTRAL,
@@ -88,93 +237,98 @@ async def process_denoising(
 @task_processor.process_task("spectral_denoising")
 def denoise_audio(self, job_id: int):
     """Audio denoising task using spectral gating"""
+    # self.request is thread-local; read it here, not on the worker loop
+    task_id = self.request.id
     try:
-        init_worker()
-        
         async def process_job():
-            input_temp = None
-            output_temp = None
+            source = None
+            sink = None
             
             try:
-                async with get_job_session(job_id) as (session, job):
+                async with get_job_session(job_id, task_id) as (session, job):
+                    if job is None:
+                        logger.warning(f"Job {job_id} was claimed by another worker, skipping")
+                        return None
+                    
                     try:
-                        # Update status to processing
-                        job.status = ProcessingStatus.PROCESSING
+                        # Download from S3 into memory (spilling to disk only for long files)
+                        storage_service = get_storage_service()
+                        source = await storage_service.open_readable(job.input_path)
+                        sink = tempfile.SpooledTemporaryFile(max_size=settings.SPOOL_MAX_SIZE)
+                        
+                        # Process audio
+                        result = await process_denoising(
+                            job=job,
+                            source=source,
+                            sink=sink
+                        )
+                        
+                        # Upload processed file to S3
+                        output_key = output_key_for(job_id, job.input_path)
+                        
+                        # Upload straight from the output buffer
+                        sink.seek(0)
+                        await storage_service.upload_file(sink, output_key)
+                        
+                        # Update job with S3 path
+                        job.output_path = output_key
+                        job.stats = result["stats"]
+                        job.status = ProcessingStatus.COMPLETED
+                        job.completed_at = job.updated_at = datetime.utcnow()
                         await session.commit()
                         
-                        # Create temporary files for processing
-                        input_temp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-                        output_temp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+                        logger.info(f"Successfully processed job {job_id}")
+                        return result
                         
-                        try:
-                            # Download from S3 to temp file
-                            storage_service = StorageService()
-                            await storage_service.download_file(
-                                job.input_path,
-                                input_temp.name
-                            )
-                            input_temp.flush()
-                            
-                            # Process audio
-                            result = await process_denoising(
-                                job=job,
-                                input_temp=input_temp.name,
-                                output_temp=output_temp.name
-                            )
-                            
-                            # Upload processed file to S3
-                            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-                            filename = Path(job.input_path).stem
-                            output_key = f"processed/spectral_denoiser/{job_id}/{timestamp}_{filename}_denoised.wav"
-                            
-                            # Upload using file path
-                            await storage_service.upload_file(
-                                output_temp.name,
-                                output_key
-                            )
-                            
-                            # Update job with S3 path
-                            job.output_path = output_key
-                            job.stats = result["stats"]
-                            job.status = ProcessingStatus.COMPLETED
-                            job.completed_at = datetime.utcnow()
-                            await session.commit()
-                            
-                            logger.info(f"Successfully processed job {job_id}")
-                            return result
-                            
-                        except Exception as e:
-                            logger.error(f"Processing failed for job {job_id}: {str(e)}")
-                            job.status = ProcessingStatus.FAILED
-                            job.error_message = str(e)
-                            await session.commit()
-                            raise
-                            
-                        finally:
-                            # Always cleanup temp files
-                            for temp_file in [input_temp, output_temp]:
-                                if temp_file:
-                                    try:
-                                        temp_file.close()
-                                        if os.path.exists(temp_file.name):
-                                            os.unlink(temp_file.name)
-                                    except Exception as e:
-                                        logger.warning(f"Failed to cleanup temp file {temp_file.name}: {e}")
-                                
                     except Exception as e:
-                        logger.error(f"Task failed for job {job_id}: {str(e)}")
-                        if self.request.retries < self.max_retries:
-                            raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+                        logger.error(f"Processing failed for job {job_id}: {str(e)}")
+                        job.status = ProcessingStatus.FAILED
+                        job.error_message = str(e)
+                        await session.commit()
                         raise
                         
+                    finally:
+                        # Spooled buffers free their memory (or delete their spill file) on close
+                        for buffer in (source, sink):
+                            if buffer is not None:
+                                buffer.close()
+                        
             except Exception as e:
                 logger.error(f"Failed to process job {job_id}: {str(e)}")
                 raise
                 
-        return run_async(process_job())
+        try:
+            return run_async(process_job())
+        except Exception as e:
+            # Retry from the task thread, where the request context is populated
+            if self.request.retries < self.max_retries:
+                raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+            raise
         
     except Exception as e:
         logger.error(f"Spectral denoising failed for job {job_id}: {str(e)}")
         raise
     finally:
-        resource_optimizer.cleanup()
\ No newline at end of file
+        resource_optimizer.maybe_cleanup()
+
+@celery_app.task(
+    name=CeleryTasks.SPECTRAL_DENOISE_AUDIO_BATCH,
+    queue=CeleryQueues.SPECTRAL,
+    bind=True,
+    soft_time_limit=3300,
+    time_limit=3600,
+    acks_late=True,
+    reject_on_worker_lost=True
+)
+@task_processor.process_task("spectral_denoising")
+def denoise_audio_batch(self, job_ids: List[int]):
+    """Spectral denoising task for several jobs, pipelining download, compute and upload"""
+    try:
+        outcomes = run_async(process_batch(job_ids, self.request.id))
+        logger.info(f"Denoised {len(outcomes['completed'])}/{len(job_ids)} jobs in batch")
+        return outcomes
+    except Exception as e:
+        logger.error(f"Spectral denoising failed for job batch {job_ids}: {str(e)}")
+        raise
+    finally:
+        resource_optimizer.maybe_cleanup()
@@ -1,6 +1,58 @@
 from app.core.celery_app import celery_app
 from app.core.task_processor import task_processor
 from app.core.constants import CeleryTasks, CeleryQueues
+from app.core.service_registry import get_translation_service
+from app.core.cache import cache_manager
+from app.core.worker_loop import run_async
+from app.db.session import AsyncSessionLocal
+from app.models.audio import TranslationJob, ProcessingStatus
+from datetime import datetime
+from typing import Any, Dict
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def process_job(job_id: int) -> Dict[str, Any]:
+    """Translate the job's audio and record the terminal state"""
+    async with AsyncSessionLocal() as session:
+        job = await session.get(TranslationJob, job_id)
+        if not job:
+            raise ValueError(f"Job {job_id} not found")
+
+        # Processing is tracked in Redis; the row is only written at the terminal state.
+        # The Redis client is synchronous, so keep it off the shared worker loop
+        await asyncio.to_thread(cache_manager.mark_job_active, "translation", job_id)
+        try:
+            service = get_translation_service()
+            # input_path is an S3 key; the service downloads by URL
+            audio_url = service.storage_service.generate_presigned_url(job.input_path)
+            transcript_path, detected_language = await service.translate_audio(
+                audio_url,
+                target_language=job.target_language,
+                source_language=job.source_language
+            )
+
+            job.transcript_path = transcript_path
+            job.source_language = job.source_language or detected_language
+            job.status = ProcessingStatus.COMPLETED
+            job.completed_at = datetime.utcnow()
+            await session.commit()
+
+            logger.info(f"Translation completed for job {job_id}")
+            return {
+                "transcript_path": transcript_path,
+                "source_language": job.source_language
+            }
+
+        except Exception as e:
+            job.status = ProcessingStatus.FAILED
+            job.error_message = str(e)
+            await session.commit()
+            logger.error(f"Translation failed for job {job_id}: {str(e)}")
+            raise
+        finally:
+            await asyncio.to_thread(cache_manager.clear_job_active, "translation", job_id)
 
 @celery_app.task(
     name=CeleryTasks.TRANSLATE_AUDIO,
@@ -13,4 +65,5 @@ from app.core.constants import CeleryTasks, CeleryQueues
 @task_processor.process_task("audio_translation")
 def translate_audio(self, job_id: int):
     """Audio translation task"""
-    # Rest of the code remains the same
\ No newline at end of file
+    # Celery pools can't run coroutines; hand it to the persistent worker loop
+    return run_async(process_job(job_id))
@@ -1,22 +1,20 @@
 from app.core.celery_app import celery_app
 from app.core.task_processor import task_processor
 from app.core.constants import CeleryTasks, CeleryQueues
-from app.services.voice_cloning import VoiceCloningService
+from app.core.service_registry import get_voice_service
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 from app.models.audio import CloningJob, ProcessingStatus, Voice
 from datetime import datetime
+from typing import List
 import logging
-from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy import create_engine
 from app.core.config import get_settings
+from app.db.session import get_sync_sessionmaker
+from app.core.cache import cache_manager
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Create synchronous engine and session factory for Celery tasks
-engine = create_engine(settings.sync_database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 @celery_app.task(
     name=CeleryTasks.CLONE_VOICE,
     queue=CeleryQueues.VOICE,
@@ -28,25 +26,27 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 @task_processor.process_task("voice_cloning")
 def clone_voice(self, job_id: int):
     """Voice cloning task"""
-    voice_service = VoiceCloningService()
+    voice_service = get_voice_service()
+    SessionLocal = get_sync_sessionmaker()
     
     # Use synchronous session
     with SessionLocal() as db:
         try:
-            # Get job with voice relationship
-            job = db.query(CloningJob).filter(CloningJob.id == job_id).first()
+            # Get job with voice relationship in one round trip
+            job = db.scalar(
+                select(CloningJob)
+                .options(joinedload(CloningJob.voice))
+                .where(CloningJob.id == job_id)
+            )
             if not job:
                 raise ValueError(f"Job {job_id} not found")
             
-            # Get voice
-            voice = db.query(Voice).filter(Voice.id == job.voice_id).first()
+            voice = job.voice
             if not voice:
                 raise ValueError(f"Voice {job.voice_id} not found")
             
-            # Update status to processing
-            job.status = ProcessingStatus.PROCESSING
-            job.updated_at = datetime.utcnow()
-            db.commit()
+            # Processing is tracked in Redis; the row is only written at the terminal state
+            cache_manager.mark_job_active("voice", job_id)
             
             try:
                 # Do voice cloning using sync version for Celery
@@ -62,8 +62,7 @@ def clone_voice(self, job_id: int):
                 # Update success status
                 job.status = ProcessingStatus.COMPLETED
                 job.output_path = output_path
-                job.completed_at = datetime.utcnow()
-                job.updated_at = datetime.utcnow()
+                job.completed_at = job.updated_at = datetime.utcnow()
                 db.commit()
                 
                 logger.info(f"Successfully cloned voice for job {job_id}")
@@ -82,4 +81,84 @@ def clone_voice(self, job_id: int):
         except Exception as e:
             logger.error(f"Error processing job {job_id}: {str(e)}")
             db.rollback()
-            raise
\ No newline at end of file
+            raise
+        finally:
+            cache_manager.clear_job_active("voice", job_id)
+
+@celery_app.task(
+    name=CeleryTasks.CLONE_VOICE_BATCH,
+    queue=CeleryQueues.VOICE,
+    bind=True,
+    max_retries=3,
+    soft_time_limit=3300,
+    time_limit=3600
+)
+@task_processor.process_task("voice_cloning")
+def clone_voice_batch(self, job_ids: List[int]):
+    """Voice cloning task for several jobs decoded together on the GPU"""
+    voice_service = get_voice_service()
+    SessionLocal = get_sync_sessionmaker()
+    
+    with SessionLocal() as db:
+        try:
+            jobs = db.query(CloningJob).filter(CloningJob.id.in_(job_ids)).all()
+            voice_ids = {job.voice_id for job in jobs}
+            voices = {
+                voice.id: voice
+                for voice in db.query(Voice).filter(Voice.id.in_(voice_ids)).all()
+            }
+            
+            runnable = []
+            now = datetime.utcnow()
+            for job in jobs:
+                if job.voice_id not in voices:
+                    job.status = ProcessingStatus.FAILED
+                    job.error_message = f"Voice {job.voice_id} not found"
+                    job.updated_at = now
+                    continue
+                cache_manager.mark_job_active("voice", job.id)
+                runnable.append(job)
+            
+            # Per-lane progress, reported as the mean across the batch
+            lane_progress = [0.0] * len(runnable)
+            def on_progress(idx: int, progress: float):
+                lane_progress[idx] = progress
+                self.update_state(
+                    state='PROGRESS',
+                    meta={
+                        'progress': sum(lane_progress) / len(lane_progress),
+                        'jobs': dict(zip((job.id for job in runnable), lane_progress))
+                    }
+                )
+            
+            results = voice_service.clone_voice_batch_sync(
+                voice_file_paths=[voices[job.voice_id].file_path for job in runnable],
+                texts=[job.input_text for job in runnable],
+                progress_callback=on_progress
+            )
+            
+            now = datetime.utcnow()
+            outputs = {}
+            for job, result in zip(runnable, results):
+                job.updated_at = now
+                if isinstance(result, Exception):
+                    job.status = ProcessingStatus.FAILED
+                    job.error_message = str(result)
+                    logger.error(f"Failed to clone voice for job {job.id}: {str(result)}")
+                else:
+                    job.status = ProcessingStatus.COMPLETED
+                    job.output_path = result
+                    job.completed_at = now
+                    outputs[job.id] = result
+            db.commit()
+            
+            logger.info(f"Cloned {len(outputs)}/{len(job_ids)} voices in batch")
+            return outputs
+            
+        except Exception as e:
+            logger.error(f"Error processing job batch {job_ids}: {str(e)}")
+            db.rollback()
+            raise
+        finally:
+            for job_id in job_ids:
+                cache_manager.clear_job_active("voice", job_id)
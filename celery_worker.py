@@ -6,7 +6,7 @@ from app.core.task_manager import task_manager
 from app.db.session import AsyncSessionLocal
 import logging
 from app.core.config import get_settings
-import asyncio
+import torch
 from celery.signals import (
     worker_init, worker_process_init,
     worker_ready, worker_shutting_down,
@@ -14,8 +14,10 @@ from celery.signals import (
     task_success, task_failure,
     task_retry, task_revoked
 )
+from celery.concurrency.thread import TaskPool as ThreadTaskPool
 from app.core.constants import CeleryTasks
-from app.core.optimization import ResourceOptimizer
+from app.core.optimization import resource_optimizer
+from app.core.worker_loop import get_worker_loop, run_async, stop_worker_loop
 
 # Initialize settings and logging
 logger = logging.getLogger(__name__)
@@ -36,14 +38,66 @@ os.environ['PYTORCH_ENABLE_MPS_FALLBACK'] = '1'
 def init_worker(**kwargs):
     """Initialize worker process"""
     logger.info("Initializing worker process...")
+    
+    # CPU-only load; pool children inherit the weights instead of rereading them
+    if settings.DENOISER_PRELOAD_WEIGHTS:
+        from app.services.denoiser_service import preload_denoiser_weights
+        preload_denoiser_weights()
+
+def warm_models():
+    """Load GPU models once so the first task doesn't pay for it"""
+    if settings.XTTS_PRELOAD_MODEL:
+        from app.core.service_registry import get_voice_service
+        # Starts the batch scheduler too, which runs any compile warmup
+        get_voice_service().scheduler.wait_ready()
+        logger.info("XTTS model loaded in worker process")
+    if settings.DENOISER_WARM_START:
+        from app.core.service_registry import get_denoiser_service
+        get_denoiser_service()
+        logger.info("Denoiser model loaded in worker process")
+
+def init_task_modules():
+    """Process-lifetime setup for the task modules"""
+    from app.workers import speaker_tasks, spectral_denoiser_tasks
+    from app.core.service_registry import get_storage_service
+    speaker_tasks.init_worker()
+    spectral_denoiser_tasks.init_worker()
+    # One boto3 client and connection pool per process, built before the first task
+    get_storage_service()
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Warm the models each pool process serves (prefork and solo pools)"""
+    # Workers only run inference; grad mode is per thread, so this covers the task thread here
+    torch.set_grad_enabled(False)
+    # Async DB pools and HTTP sessions live on this loop for the life of the process
+    get_worker_loop()
+    init_task_modules()
+    warm_models()
+
+@worker_ready.connect
+def worker_ready_handler(sender=None, **kwargs):
+    """Threads pools share the main process, which never sees worker_process_init"""
+    if isinstance(getattr(sender, "pool", None), ThreadTaskPool):
+        init_task_modules()
+        warm_models()
+
+@worker_shutting_down.connect
+def worker_shutting_down_handler(**kwargs):
+    """Stop the persistent event loop thread"""
+    stop_worker_loop()
 
 @task_prerun.connect
 def task_prerun_handler(task_id, task, args, kwargs, **_):
     """Handler called before task execution"""
     logger.info(f"Starting task: {task.name}[{task_id}]")
     
-    # Optimize for denoising tasks
-    if task.name in [CeleryTasks.DENOISE_AUDIO, CeleryTasks.SPECTRAL_DENOISE_AUDIO]:
+    # Per-task mode switch; process-lifetime setup lives in init_task_modules
+    if task.name in [
+        CeleryTasks.DENOISE_AUDIO,
+        CeleryTasks.SPECTRAL_DENOISE_AUDIO,
+        CeleryTasks.SPECTRAL_DENOISE_AUDIO_BATCH
+    ]:
         resource_optimizer.optimize_for_denoising()
     else:
         resource_optimizer.optimize_for_inference()
@@ -63,11 +117,11 @@ def task_failure_handler(task_id, exception, args, kwargs, traceback, **_):
             async with AsyncSessionLocal() as db:
                 await task_manager.handle_failed_job(job_id, str(exception), db)
         
-        loop = asyncio.new_event_loop()
+        # Reuse the worker loop and its pooled connections instead of a throwaway loop
         try:
-            loop.run_until_complete(update_failed_job())
-        finally:
-            loop.close()
+            run_async(update_failed_job(), timeout=10)
+        except Exception as e:
+            logger.error(f"Failed to record failure for job {job_id}: {str(e)}")
 
 if __name__ == '__main__':
     try:
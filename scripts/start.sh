@@ -137,16 +137,14 @@ start_workers() {
     elif [ "$mode" = "prod" ]; then
         # Production mode - separate workers for each queue
         # Voice queue worker (GPU intensive)
+        # The threads pool ignores time limits and per-child recycling; synthesis
+        # carries its own deadline (XTTS_SYNTHESIS_TIMEOUT)
         poetry run celery -A celery_worker worker \
             --loglevel=info \
             -Q voice-queue \
             -n voice_worker@%h \
-            --pool=solo \
-            --concurrency=1 \
-            --max-tasks-per-child=100 \
-            --max-memory-per-child=4000000 \
-            --time-limit=3600 \
-            --soft-time-limit=3300 &
+            --pool=threads \
+            --concurrency=4 &
             
         # Translation queue worker (CPU intensive)
         poetry run celery -A celery_worker worker \
@@ -162,16 +160,14 @@ start_workers() {
     fi
     
     # Denoiser worker
+    # No time limits or per-child recycling under the threads pool; processing is
+    # bounded by DENOISER_PROCESS_TIMEOUT instead
     poetry run celery -A celery_worker worker \
         --loglevel=info \
         -Q denoiser-queue \
         -n denoiser_worker@%h \
-        --pool=solo \
-        --concurrency=2 \
-        --max-tasks-per-child=50 \
-        --max-memory-per-child=2000000 \
-        --time-limit=1000 \
-        --soft-time-limit=900 &
+        --pool=threads \
+        --concurrency=4 &
 }
 
 # Function to start services
@@ -253,11 +249,11 @@ stop_services() {
 start_denoiser_workers() {
     echo "Starting denoiser workers..."
     
-    # Start Denoiser worker
+    # Start Denoiser worker; threads share one copy of the model on the GPU
     poetry run celery -A app.workers.celery_worker worker \
         -Q denoiser-queue \
-        --concurrency=2 \
-        --pool=solo \
+        --concurrency=4 \
+        --pool=threads \
         --loglevel=info &
         
     # Start Spectral denoiser worker
@@ -1,15 +1,41 @@
 import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
 from app.db.base import Base
 from app.main import app
 from fastapi.testclient import TestClient
+from httpx import AsyncClient
 from app.core.config import get_settings
 import asyncio
 from typing import AsyncGenerator
 
 settings = get_settings()
 
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kw):
+    """Unit tests run on SQLite, which stores JSONB columns as JSON"""
+    return "JSON"
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        default=False,
+        help="run integration tests, against the configured Postgres database and S3 instead of in-memory SQLite"
+    )
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests that touch external services unless --run-integration is given"""
+    if config.getoption("--run-integration"):
+        return
+    skip_integration = pytest.mark.skip(reason="needs --run-integration")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
+
 @pytest.fixture(scope="session")
 def event_loop():
     loop = asyncio.get_event_loop_policy().new_event_loop()
@@ -17,24 +43,60 @@ def event_loop():
     loop.close()
 
 @pytest.fixture(scope="session")
-async def test_db_engine():
-    engine = create_async_engine(settings.database_url, echo=True)
+async def test_db_engine(request):
+    integration = request.config.getoption("--run-integration")
+    if integration:
+        engine = create_async_engine(settings.database_url, echo=True)
+    else:
+        # One shared in-memory connection, so every session sees the same schema
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False}
+        )
+
+        # pysqlite's implicit transactions break SAVEPOINT; emit BEGIN ourselves
+        @event.listens_for(engine.sync_engine, "connect")
+        def _disable_implicit_begin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine.sync_engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+        if integration:
+            await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
     yield engine
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+    if integration:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
     await engine.dispose()
 
-@pytest.fixture
+@pytest.fixture(scope="function")
 async def test_db(test_db_engine) -> AsyncGenerator[AsyncSession, None]:
-    async_session = sessionmaker(
-        test_db_engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with async_session() as session:
-        yield session
+    """Session inside an outer transaction that is rolled back after each test"""
+    async with test_db_engine.connect() as conn:
+        outer = await conn.begin()
+        # Commits inside the test release a SAVEPOINT instead of the outer transaction
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint"
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await outer.rollback()
 
 @pytest.fixture
 def client() -> TestClient:
-    return TestClient(app) 
\ No newline at end of file
+    return TestClient(app) 
+
+@pytest.fixture(scope="module")
+async def async_client() -> AsyncGenerator[AsyncClient, None]:
+    """One ASGI client per test module instead of one per test"""
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        yield ac
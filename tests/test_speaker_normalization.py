@@ -1,37 +1,173 @@
 import pytest
-import torch
-import torchaudio
+import asyncio
 import io
 import logging
+import math
+import struct
+from typing import Tuple
 from app.services.storage_service import StorageService
 from app.core.config import get_settings
 import numpy as np
 from scipy.io import wavfile
 
+try:
+    import numpy_rms
+except ImportError:  # optional SIMD kernel; numpy fallback below
+    numpy_rms = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+if njit is not None:
+    @njit(parallel=True, fastmath=True, boundscheck=False, cache=True)
+    def _normalize_kernel(w: np.ndarray, target_rms: float) -> np.ndarray:
+        """Sum of squares and peak in one streaming pass, then one scaled write"""
+        ss = 0.0
+        pk = 0.0
+        for i in prange(w.size):
+            ss += w[i] * w[i]
+            pk = max(pk, abs(w[i]))
+        gain = target_rms / (np.sqrt(ss / w.size) + 1e-6)
+        if gain * pk > 0.95:
+            gain = 0.95 / pk
+        out = np.empty_like(w)
+        for i in prange(w.size):
+            out[i] = w[i] * gain
+        return out
+
+    @njit(parallel=True, fastmath=True, boundscheck=False, cache=True)
+    def _pcm16_kernel(w: np.ndarray) -> np.ndarray:
+        """Scale, round, clip and cast to int16 in one pass"""
+        out = np.empty(w.size, dtype=np.int16)
+        for i in prange(w.size):
+            # Round like the np.rint fallback so results don't depend on numba being installed
+            out[i] = np.int16(max(-32768.0, min(32767.0, np.rint(w[i] * 32767.0))))
+        return out
+
+    @njit(parallel=True, fastmath=True, boundscheck=False, cache=True)
+    def _normalize_pcm16_kernel(w: np.ndarray, target_rms: float) -> np.ndarray:
+        """int16 in, int16 out: integer sum of squares and peak, then one scaled write"""
+        ss = 0
+        pk = 0
+        for i in prange(w.size):
+            v = np.int64(w[i])
+            ss += v * v
+            pk = max(pk, abs(v))
+        gain = target_rms / (np.sqrt(ss / w.size) / 32768.0 + 1e-6)
+        if gain * pk > 0.95 * 32768.0:
+            gain = 0.95 * 32768.0 / pk
+        out = np.empty_like(w)
+        for i in prange(w.size):
+            # Truncation keeps every sample inside the limited peak
+            out[i] = np.int16(w[i] * gain)
+        return out
+else:
+    _normalize_kernel = None
+    _pcm16_kernel = None
+    _normalize_pcm16_kernel = None
+
+def signal_stats(waveform: np.ndarray, block: int = 16384) -> Tuple[np.float32, np.float32]:
+    """RMS and peak in one pass over cache-sized slabs, relative to full scale"""
+    flat = waveform.reshape(-1)
+    if flat.size == 0:
+        return np.float32(0.0), np.float32(0.0)
+    # Signed PCM accumulates exactly in int64 and is scaled once at the end
+    integer = np.issubdtype(flat.dtype, np.integer)
+    acc_dtype = np.int64 if integer else None
+    full_scale = float(-np.iinfo(flat.dtype).min) if integer else 1.0
+    ss = 0.0
+    peak = 0.0
+    # 16384 float32 samples is 64 KiB; each slab stays in cache for all three reductions
+    for start in range(0, flat.size, block):
+        slab = flat[start:start + block]
+        ss += float(np.einsum('i,i->', slab, slab, dtype=acc_dtype))
+        peak = max(peak, float(slab.max()), -float(slab.min()))
+    return np.float32(math.sqrt(ss / flat.size) / full_scale), np.float32(peak / full_scale)
+
 def normalize_audio(waveform: np.ndarray, target_db: float = -18.0) -> np.ndarray:
     """Quick RMS normalization with peak limiting"""
-    # Calculate current RMS
-    rms = np.sqrt(np.mean(np.square(waveform)))
+    # Contiguous float32 keeps numpy on its SIMD loops and halves bandwidth vs float64
+    waveform = np.ascontiguousarray(waveform, dtype=np.float32)
+    flat = waveform.reshape(-1)
     
     # Calculate target RMS (convert from dB)
-    target_rms = 10 ** (target_db / 20.0)
+    target_rms = np.float32(10 ** (target_db / 20.0))
+    
+    if _normalize_kernel is not None:
+        return _normalize_kernel(flat, target_rms).reshape(waveform.shape)
+    
+    # Calculate current RMS and peak of the original signal
+    if numpy_rms is not None and (waveform.ndim == 1 or waveform.shape[1] == 1):
+        # One window spanning the whole mono signal
+        rms = np.float32(numpy_rms.rms(flat, window_size=flat.size)[0])
+        peak = max(flat.max(), -flat.min())
+    else:
+        rms, peak = signal_stats(flat)
+    
+    # Calculate gain needed; float32 scalars so nothing promotes to float64
+    gain = target_rms / (rms + np.float32(1e-6))  # Avoid division by zero
+    
+    # Fold peak limiting into the gain to prevent clipping
+    if gain * peak > np.float32(0.95):  # Leave some headroom
+        gain = np.float32(0.95) / peak
+    
+    # Apply gain once
+    return waveform * gain
+
+def to_pcm16(waveform: np.ndarray) -> np.ndarray:
+    """Quantize [-1, 1] float audio to int16 PCM without a float64 intermediate"""
+    if _pcm16_kernel is not None:
+        return _pcm16_kernel(np.ascontiguousarray(waveform.ravel())).reshape(waveform.shape)
     
-    # Calculate gain needed
-    gain = target_rms / (rms + 1e-6)  # Avoid division by zero
+    scratch = np.multiply(waveform, np.float32(np.iinfo(np.int16).max), dtype=np.float32)
+    np.rint(scratch, out=scratch)
+    np.clip(scratch, np.iinfo(np.int16).min, np.iinfo(np.int16).max, out=scratch)
+    return scratch.astype(np.int16)
+
+def normalize_pcm16(samples: np.ndarray, target_db: float = -18.0) -> np.ndarray:
+    """RMS normalization with peak limiting for int16 PCM, without a dequantize/requantize round trip"""
+    samples = np.ascontiguousarray(samples, dtype=np.int16)
+    flat = samples.reshape(-1)
+    target_rms = 10 ** (target_db / 20.0)
     
-    # Apply gain
-    normalized = waveform * gain
+    if _normalize_pcm16_kernel is not None:
+        return _normalize_pcm16_kernel(flat, target_rms).reshape(samples.shape)
     
-    # Apply peak limiting to prevent clipping
-    max_peak = np.max(np.abs(normalized))
-    if max_peak > 0.95:  # Leave some headroom
-        normalized = normalized * (0.95 / max_peak)
+    rms, peak = signal_stats(flat)
+    gain = target_rms / (float(rms) + 1e-6)
+    if gain * peak > 0.95:
+        gain = 0.95 / float(peak)
     
-    return normalized
+    # Gain is unitless, so int16 maps straight to int16; truncation stays under the limited peak
+    scratch = np.multiply(flat, np.float32(gain), dtype=np.float32)
+    return scratch.astype(np.int16).reshape(samples.shape)
 
+def pcm16_wav(pcm: np.ndarray, sample_rate: int) -> io.BytesIO:
+    """Canonical 44-byte PCM WAV header and int16 payload written into one presized BytesIO"""
+    channels = 1 if pcm.ndim == 1 else pcm.shape[1]
+    data_size = pcm.nbytes
+    buffer = io.BytesIO()
+    # Grow the internal buffer once, then fill it through a view instead of write() calls
+    buffer.seek(43 + data_size)
+    buffer.write(b'\0')
+    with buffer.getbuffer() as view:
+        struct.pack_into(
+            '<4sI4s4sIHHIIHH4sI', view, 0,
+            b'RIFF', 36 + data_size, b'WAVE',
+            b'fmt ', 16, 1, channels, sample_rate, sample_rate * channels * 2, channels * 2, 16,
+            b'data', data_size
+        )
+        # Copy samples straight into the payload, no intermediate bytes object
+        np.frombuffer(view, dtype='<i2', offset=44)[:] = pcm.reshape(-1)
+    buffer.seek(0)
+    return buffer
+
+@pytest.mark.integration
 @pytest.mark.asyncio
 async def test_speaker_normalization():
     """Test speaker audio normalization workflow"""
@@ -43,61 +179,87 @@ async def test_speaker_normalization():
         source_path = "processed/5370428f-ad2a-4582-bdef-8a66eb6a553e/speaker_0.wav"
         normalized_path = "processed/5370428f-ad2a-4582-bdef-8a66eb6a553e/speaker_0_normalized.wav"
         
-        # Download original audio
+        # Stream the original audio into memory as S3 delivers it
         logger.info(f"Downloading audio from {source_path}")
-        audio_data = await storage.download_file(source_path)
-        
-        # Load audio
-        with io.BytesIO(audio_data) as buffer:
-            # Load with torchaudio
-            waveform, sample_rate = torchaudio.load(buffer)
+        with io.BytesIO() as buffer:
+            async for chunk in storage.download_stream(source_path):
+                buffer.write(chunk)
+            buffer.seek(0)
+            
+            # PCM WAV decodes straight to numpy; no torch backend or tensor copy
+            sample_rate, data = wavfile.read(buffer)
+            
+            # Mono comes back as a contiguous 1-D vector; a single-channel 2-D array is flattened, not averaged
+            if data.ndim == 2 and data.shape[1] == 1:
+                data = data.reshape(-1)
             
-            # Convert to mono if stereo
-            if waveform.shape[0] > 1:
-                waveform = torch.mean(waveform, dim=0, keepdim=True)
+            # Downmix 16-bit stereo in integers so only one channel is converted to float
+            if data.ndim == 2 and data.shape[1] == 2 and data.dtype == np.int16:
+                data = ((data[:, 0].astype(np.int32) + data[:, 1]) >> 1).astype(np.int16)
             
-            # Convert to numpy for processing
-            audio_np = waveform.numpy().T
+            # 16-bit mono stays in the integer domain; everything else is normalized in float32
+            int16_path = data.dtype == np.int16 and data.ndim == 1
+            
+            if int16_path:
+                audio_np = data
+            else:
+                # Scale integer PCM to [-1, 1) in place on the converted copy; 8-bit WAV is unsigned with a 128 offset
+                if data.dtype == np.uint8:
+                    audio_np = data.astype(np.float32)
+                    audio_np -= np.float32(128.0)
+                    audio_np *= np.float32(1.0 / 128.0)
+                elif np.issubdtype(data.dtype, np.integer):
+                    audio_np = data.astype(np.float32)
+                    audio_np *= np.float32(-1.0 / np.iinfo(data.dtype).min)
+                else:
+                    audio_np = data.astype(np.float32, copy=False)
+                
+                # Average any remaining channels
+                if audio_np.ndim == 2:
+                    audio_np = audio_np.mean(axis=1, dtype=np.float32)
             
             # Get original stats
-            original_rms = np.sqrt(np.mean(np.square(audio_np)))
-            original_peak = np.max(np.abs(audio_np))
-            logger.info(f"Original stats - RMS: {20 * np.log10(original_rms):.2f} dB, Peak: {original_peak:.2f}")
+            original_rms, original_peak = signal_stats(audio_np)
+            original_rms_db = 20.0 * math.log10(float(original_rms) + 1e-12)
+            logger.info(f"Original stats - RMS: {original_rms_db:.2f} dB, Peak: {original_peak:.2f}")
             
             # Normalize audio
-            normalized = normalize_audio(
-                audio_np,
-                target_db=-18.0  # Target RMS level
-            )
+            if int16_path:
+                pcm = normalize_pcm16(audio_np, target_db=-18.0)
+                assert pcm.dtype == np.int16, "16-bit input should normalize without leaving int16"
+                final_rms, final_peak = signal_stats(pcm)
+            else:
+                normalized = normalize_audio(
+                    audio_np,
+                    target_db=-18.0  # Target RMS level
+                )
+                
+                assert normalized.dtype == np.float32, "Normalization should stay in float32"
+                
+                final_rms, final_peak = signal_stats(normalized)
+                pcm = to_pcm16(normalized)
             
             # Get final stats
-            final_rms = np.sqrt(np.mean(np.square(normalized)))
-            final_peak = np.max(np.abs(normalized))
-            logger.info(f"Final stats - RMS: {20 * np.log10(final_rms):.2f} dB, Peak: {final_peak:.2f}")
+            final_rms_db = 20.0 * math.log10(float(final_rms) + 1e-12)
+            logger.info(f"Final stats - RMS: {final_rms_db:.2f} dB, Peak: {final_peak:.2f}")
             
-            # Save normalized audio
-            buffer = io.BytesIO()
-            wavfile.write(
-                buffer,
-                sample_rate,
-                (normalized * np.iinfo(np.int16).max).astype(np.int16)
-            )
-            buffer.seek(0)
+            # Encode normalized audio as a single WAV buffer
+            wav_buffer = pcm16_wav(pcm, sample_rate)
             
-            # Upload normalized version
-            await storage.upload_file(buffer.getvalue(), normalized_path)
+            # Upload normalized version and sign its URL concurrently
+            _, url = await asyncio.gather(
+                storage.upload_fileobj(wav_buffer, normalized_path),
+                storage.get_presigned_url(normalized_path)
+            )
             logger.info(f"Uploaded normalized audio to {normalized_path}")
-            
-            # Generate pre-signed URL
-            url = await storage.get_presigned_url(normalized_path)
             logger.info(f"Pre-signed URL for normalized audio: {url}")
             
             # Return results for assertions
             result = {
                 "original_path": source_path,
                 "normalized_path": normalized_path,
-                "original_rms_db": float(20 * np.log10(original_rms)),
-                "final_rms_db": float(20 * np.log10(final_rms)),
+                "original_rms_db": original_rms_db,
+                "final_rms_db": final_rms_db,
                 "original_peak": float(original_peak),
                 "final_peak": float(final_peak),
                 "download_url": url
@@ -119,7 +281,6 @@ if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     
     # Run test
-    import asyncio
     result = asyncio.run(test_speaker_normalization())
     
     # Print detailed results
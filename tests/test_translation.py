@@ -1,35 +1,29 @@
 import pytest
-from httpx import AsyncClient
-from app.main import app
-import io
+import asyncio
 
-@pytest.mark.asyncio
-async def test_create_translation_job():
-    # Create a mock audio file
-    audio_data = io.BytesIO(b"mock audio data")
-    audio_data.name = "test.wav"
-    
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        response = await ac.post(
-            "/api/v1/translation/translate/",
-            data={
-                "target_language": "es",
-                "source_language": "en"
-            },
-            files={"file": ("test.wav", audio_data, "audio/wav")}
-        )
-    assert response.status_code == 200
-    assert response.json()["status"] == "pending"
+# Mock audio payload shared by every upload
+AUDIO_BYTES = b"mock audio data"
 
 @pytest.mark.asyncio
-async def test_list_translations():
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        response = await ac.get("/api/v1/translation/translations/")
+async def test_create_translation_job(async_client):
+    response = await async_client.post(
+        "/api/v1/translation/translate/",
+        data={
+            "target_language": "es",
+            "source_language": "en"
+        },
+        files={"file": ("test.wav", AUDIO_BYTES, "audio/wav")}
+    )
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    assert response.json()["status"] == "pending"
 
 @pytest.mark.asyncio
-async def test_get_translation():
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        response = await ac.get("/api/v1/translation/translations/1")
-    assert response.status_code == 200 or response.status_code == 404 
\ No newline at end of file
+async def test_read_translations(async_client):
+    # Independent reads run concurrently against the in-process app
+    list_response, get_response = await asyncio.gather(
+        async_client.get("/api/v1/translation/translations/"),
+        async_client.get("/api/v1/translation/translations/1")
+    )
+    assert list_response.status_code == 200
+    assert isinstance(list_response.json(), list)
+    assert get_response.status_code == 200 or get_response.status_code == 404 
\ No newline at end of file